@@ -0,0 +1,97 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark event-loop lag while logging at a high rate to a slow pipe consumer,
+comparing the synchronous StandardHandler with an AsyncStreamHandler.
+
+Usage:
+    python benchmarks/bench_async_lag.py [NUMBER]
+"""
+
+# standard libs
+import os
+import sys
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import List
+
+# internal libs
+from logalpha.handler import AsyncStreamHandler
+from logalpha.logger import AsyncLogger
+from logalpha.contrib.standard import StandardHandler, StandardLogger, DEBUG
+
+
+# reads lines slowly so that the pipe fills up
+CONSUMER = 'import sys, time\nfor line in sys.stdin.buffer: time.sleep(0.00002)'
+
+
+@dataclass
+class AsyncStandardHandler(AsyncStreamHandler, StandardHandler):
+    """Standard formatting written asynchronously."""
+
+
+class AsyncStandardLogger(AsyncLogger, StandardLogger):
+    """Standard messages with asynchronous level methods."""
+
+
+async def ticker(lags: List[float], interval: float = 0.001) -> None:
+    """Record how late each tick is scheduled."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(mode: str, number: int) -> None:
+    """Log `number` messages and report the event-loop lag."""
+    proc = await asyncio.create_subprocess_exec(sys.executable, '-c', CONSUMER, stdin=asyncio.subprocess.PIPE)
+    if mode == 'sync':
+        log = StandardLogger(__name__)
+        resource = open(proc.stdin.transport.get_extra_info('pipe').fileno(), mode='w', closefd=False)
+        StandardLogger.handlers.clear()
+        StandardLogger.handlers.append(StandardHandler(level=DEBUG, resource=resource))
+        os.set_blocking(resource.fileno(), True)  # synchronous handlers expect blocking I/O
+    else:
+        log = AsyncStandardLogger(__name__)
+        AsyncStandardLogger.handlers.clear()
+        AsyncStandardLogger.handlers.append(AsyncStandardHandler(level=DEBUG, resource=proc.stdin))
+
+    lags: List[float] = []
+    task = asyncio.ensure_future(ticker(lags))
+    start = time.perf_counter()
+    for i in range(number):
+        if mode == 'sync':
+            log.info(f'message {i}')
+        else:
+            await log.info(f'message {i}')
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    proc.stdin.close()
+    await proc.wait()
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else float('nan')
+    worst = lags[-1] if lags else float('nan')
+    print(f'{mode:<6} {number / elapsed:10.0f} msg/s  ticks={len(lags):<6} '
+          f'p99 lag={p99 * 1e3:7.2f} ms  max lag={worst * 1e3:7.2f} ms')
+
+
+def main(number: int = 100_000) -> None:
+    """Run both modes."""
+    for mode in ('sync', 'async'):
+        asyncio.run(run(mode, number))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark the cost of creating a topic-scoped logger, constructing a new
+StandardLogger versus deriving one from an existing logger with `child`.
+The cost of allocating an instance with a copy of the parent's state (the
+least any `child` that returns a full logger can do) is shown for reference.
+
+Usage:
+    python benchmarks/bench_child.py [NUMBER]
+"""
+
+# standard libs
+import sys
+import timeit
+
+# internal libs
+from logalpha.contrib.standard import StandardLogger
+
+
+def copy_state(log: StandardLogger) -> StandardLogger:
+    """Allocate a logger with a copy of the instance state of `log`."""
+    new = object.__new__(StandardLogger)
+    new.__dict__.update(log.__dict__)
+    return new
+
+
+def main(number: int = 1_000_000) -> None:
+    """Run benchmarks and print cost per logger in microseconds."""
+    log = StandardLogger(__name__)
+    for name, create in [('constructor', lambda: StandardLogger('tenant')),
+                         ('child', lambda: log.child(topic='tenant')),
+                         ('copy', lambda: copy_state(log))]:
+        elapsed = min(timeit.repeat(create, number=number, repeat=5))
+        print(f'{name:<12} {elapsed / number * 1e6:6.3f} us/logger')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
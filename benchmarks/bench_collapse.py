@@ -0,0 +1,46 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark the cost per message of a StandardHandler with and without a CollapseHandler
+in front of it, for distinct messages (the normal path) and for repeated messages.
+
+Usage:
+    python benchmarks/bench_collapse.py [NUMBER]
+"""
+
+# standard libs
+import os
+import sys
+import timeit
+import itertools
+
+# internal libs
+from logalpha.filter import CollapseHandler
+from logalpha.contrib.standard import StandardLogger, StandardHandler, DEBUG
+
+
+def main(number: int = 100_000) -> None:
+    """Run benchmarks and print cost per message in microseconds."""
+    with open(os.devnull, mode='w') as devnull:
+        log = StandardLogger(__name__)
+        counter = itertools.count()
+        direct = StandardHandler(level=DEBUG, resource=devnull)
+        for name, handler in [('direct', direct), ('collapse', CollapseHandler(target=direct))]:
+            StandardLogger.handlers.replace([handler])
+            for case, write in [('distinct', lambda: log.error('request {} failed', next(counter))),
+                                ('repeated', lambda: log.error('connection refused'))]:
+                elapsed = min(timeit.repeat(write, number=number, repeat=5))
+                print(f'{name:<10} {case:<10} {elapsed / number * 1e6:6.3f} us/message')
+            handler.flush()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,69 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark publishing to 12 handlers (10 of them above the level of the message, plus
+2 topic-matched handlers) by comparing levels for each handler in a loop versus
+looking up the handlers in the dispatch table.
+
+Usage:
+    python benchmarks/bench_dispatch.py [NUMBER]
+"""
+
+# type annotations
+from typing import List
+
+# standard libs
+import sys
+import timeit
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.level import Level
+from logalpha.handler import Handler
+from logalpha.message import Message
+from logalpha.filter import MatchHandler
+from logalpha.contrib.standard import StandardLogger, DEBUG, INFO, ERROR, CRITICAL
+
+
+@dataclass
+class NullHandler(Handler):
+    """Discard messages (so only dispatch is measured)."""
+
+    level: Level = DEBUG
+    resource: None = None
+
+    def write(self, message: Message) -> None:
+        pass
+
+
+class LoopLogger(StandardLogger):
+    """Compare levels for each handler and message (as before the dispatch table)."""
+
+    def _dispatch(self, level: Level) -> List[Handler]:
+        return [handler for handler in self.handlers if level >= handler.level]
+
+
+def main(number: int = 1_000_000) -> None:
+    """Run benchmarks and print cost per message in microseconds."""
+    handlers = ([NullHandler(level=INFO), NullHandler(level=DEBUG)] +
+                [NullHandler(level=ERROR if i % 2 else CRITICAL) for i in range(8)] +
+                [MatchHandler(resource=['other.*'], target=NullHandler()) for _ in range(2)])
+    StandardLogger.handlers.replace(handlers)
+    log = StandardLogger(__name__)
+    loop = LoopLogger(__name__)
+    for name, func in [('loop', lambda: loop.info('message')),
+                       ('table', lambda: log.info('message'))]:
+        elapsed = min(timeit.repeat(func, number=number, repeat=5))
+        print(f'{name:<8} {elapsed / number * 1e6:6.3f} us/message')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,45 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark a hot error loop (the same message over and over) through a StandardLogger
+with two StandardHandler sinks, without filters and with each kind of filter.
+
+Usage:
+    python benchmarks/bench_filter.py [NUMBER]
+"""
+
+# standard libs
+import os
+import sys
+import timeit
+
+# internal libs
+from logalpha.filter import RateLimit, Sample, FirstThenEvery
+from logalpha.contrib.standard import StandardLogger, StandardHandler, DEBUG
+
+
+def main(number: int = 100_000) -> None:
+    """Run benchmarks and print cost per message in microseconds."""
+    with open(os.devnull, mode='w') as devnull:
+        StandardLogger.handlers.replace([StandardHandler(level=DEBUG, resource=devnull),
+                                         StandardHandler(level=DEBUG, resource=devnull, template='{content}')])
+        log = StandardLogger(__name__)
+        for name, filters in [('none', []),
+                              ('rate_limit', [RateLimit(rate=1000, key='content')]),
+                              ('sample', [Sample(probability=0.01)]),
+                              ('first_every', [FirstThenEvery(first=10, every=1000, key='content')])]:
+            log.filters = filters
+            elapsed = min(timeit.repeat(lambda: log.error('connection refused'), number=number, repeat=5))
+            print(f'{name:<12} {elapsed / number * 1e6:6.3f} us/message')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
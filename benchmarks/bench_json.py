@@ -0,0 +1,56 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark the cost of serializing a StandardMessage as JSON, comparing
+dataclasses.asdict with the generated encoder, with the standard json
+module and (if installed) orjson.
+
+Usage:
+    python benchmarks/bench_json.py [NUMBER]
+"""
+
+# standard libs
+import sys
+import json
+import timeit
+import functools
+import dataclasses
+
+# internal libs
+from logalpha.level import INFO
+from logalpha.timestamp import ISO8601, WALL_NS
+from logalpha.contrib.standard import StandardMessage, HOST
+from logalpha.contrib.json import compile_encoder, _dumps_orjson, orjson
+
+
+def asdict(message: StandardMessage) -> dict:
+    """The obvious approach."""
+    fields = dataclasses.asdict(message)
+    fields['level'] = message.level.name
+    fields['timestamp'] = ISO8601(message.timestamp)
+    return fields
+
+
+def main(number: int = 100_000) -> None:
+    """Run benchmarks and print cost per message in microseconds."""
+    message = StandardMessage(level=INFO, content='message', timestamp=WALL_NS(), topic=__name__, host=HOST)
+    encoder = compile_encoder(StandardMessage, ISO8601)
+    backends = [('json', functools.partial(json.dumps, default=str, ensure_ascii=False, separators=(',', ':')))]
+    if orjson is not None:
+        backends.append(('orjson', _dumps_orjson))
+    for backend, dumps in backends:
+        for name, encode in [('asdict', asdict), ('compiled', encoder)]:
+            elapsed = min(timeit.repeat(lambda: dumps(encode(message)), number=number, repeat=5))
+            print(f'{backend:<7} {name:<9} {elapsed / number * 1e6:6.2f} us/message')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
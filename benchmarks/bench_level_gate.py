@@ -0,0 +1,55 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark the cost of suppressed versus emitted messages.
+
+Usage:
+    python benchmarks/bench_level_gate.py [NUMBER]
+"""
+
+# standard libs
+import os
+import sys
+import timeit
+
+# internal libs
+from logalpha.contrib.standard import StandardLogger, StandardHandler, WARNING
+
+
+class Noop:
+    """Baseline: a plain method call that does nothing."""
+
+    def debug(self, content: str) -> None:
+        pass
+
+
+def main(number: int = 1_000_000) -> None:
+    """Run benchmarks and print cost per call in nanoseconds."""
+
+    with open(os.devnull, mode='w') as devnull:
+        StandardLogger.handlers.clear()
+        StandardLogger.handlers.append(StandardHandler(level=WARNING, resource=devnull))
+
+        log = StandardLogger(__name__)
+        noop = Noop()
+        cases = {
+            'noop method call': lambda: noop.debug('message'),
+            'suppressed (debug)': lambda: log.debug('message'),
+            'emitted (warning)': lambda: log.warning('message'),
+        }
+
+        for name, func in cases.items():
+            elapsed = min(timeit.repeat(func, number=number, repeat=3))
+            print(f'{name:<24} {elapsed / number * 1e9:8.1f} ns/call')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
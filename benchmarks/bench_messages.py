@@ -0,0 +1,82 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Measure memory and construction time per million messages, comparing a plain
+dataclass built from a dictionary of evaluated callbacks against the slotted
+StandardMessage built by its compiled factory, with constant values either
+returned by callbacks or given as static fields.
+
+Usage:
+    python benchmarks/bench_messages.py [NUMBER]
+"""
+
+# standard libs
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Callable, Dict, Any
+
+# internal libs
+from logalpha.level import Level, INFO
+from logalpha.message import compile_factory
+from logalpha.contrib.standard import StandardMessage, HOST
+
+
+@dataclass
+class DictMessage:
+    """Equivalent to StandardMessage without slots."""
+    level: Level
+    content: str
+    timestamp: datetime
+    topic: str
+    host: str
+
+
+def dict_factory(level: Level, content: Any, callbacks: Dict[str, Callable[[], Any]],
+                 fields: Dict[str, Any] = None) -> DictMessage:
+    """The previous approach: evaluate callbacks into a new dictionary and unpack it."""
+    return DictMessage(level=level, content=content,
+                       **dict(zip(callbacks.keys(), map(lambda method: method(), callbacks.values()))))
+
+
+def measure(name: str, factory: Callable, number: int, static: bool = False) -> None:
+    """Report memory held by and time to construct `number` messages."""
+    if static:
+        callbacks, fields = {'timestamp': datetime.now}, {'host': HOST, 'topic': __name__}
+    else:
+        callbacks, fields = {'timestamp': datetime.now, 'host': (lambda: HOST), 'topic': (lambda: __name__)}, None
+
+    start = time.perf_counter()
+    for _ in range(number):
+        factory(INFO, 'message', callbacks, fields)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    messages = [factory(INFO, 'message', callbacks, fields) for _ in range(number)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+
+    scale = 1_000_000 / number
+    print(f'{name:<10} {elapsed * scale:6.2f} s/million  {current * scale / 2**20:8.1f} MiB/million')
+
+
+def main(number: int = 1_000_000) -> None:
+    """Run both cases."""
+    measure('dict', dict_factory, number)
+    measure('slotted', compile_factory(StandardMessage, ('timestamp', 'host', 'topic')), number)
+    measure('static', compile_factory(StandardMessage, ('timestamp',), ('host', 'topic')), number, static=True)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
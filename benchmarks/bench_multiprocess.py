@@ -0,0 +1,70 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark throughput with 8 and 32 worker processes each logging NUMBER messages,
+either each writing to the same file directly or sending messages to a single
+collector over a multiprocessing queue or a Unix socket.
+
+Usage:
+    python benchmarks/bench_multiprocess.py [NUMBER]
+"""
+
+# standard libs
+import os
+import sys
+import time
+import tempfile
+import multiprocessing
+
+# internal libs
+from logalpha.handler import Handler
+from logalpha.contrib.standard import StandardLogger, StandardHandler, DEBUG
+from logalpha.contrib.process import ProcessHandler, ProcessListener, UnixSocketHandler, UnixSocketListener
+
+
+def worker(handler: Handler, number: int) -> None:
+    """Log `number` messages with only `handler`."""
+    StandardLogger.handlers.replace([handler])
+    log = StandardLogger(f'worker-{os.getpid()}')
+    for i in range(number):
+        log.info('message {}', i)
+
+
+def run(name: str, handler: Handler, workers: int, number: int, listener=None) -> None:
+    """Start `workers` processes and report messages per second until all are published."""
+    start = time.perf_counter()
+    if listener is not None:
+        listener.start()
+    processes = [multiprocessing.Process(target=worker, args=(handler, number)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    if listener is not None:
+        listener.stop()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<8} workers={workers:<3} {workers * number / elapsed:10,.0f} messages/s')
+
+
+def main(number: int = 10_000) -> None:
+    """Run all cases."""
+    with tempfile.TemporaryDirectory() as tmpdir, open(os.devnull, mode='w') as devnull:
+        for workers in (8, 32):
+            run('direct', StandardHandler(level=DEBUG, resource=devnull), workers, number)
+            target = StandardHandler(level=DEBUG, resource=devnull, buffered=True)
+            listener = ProcessListener([target])
+            run('queue', ProcessHandler(level=DEBUG, resource=listener.queue), workers, number, listener)
+            listener = UnixSocketListener(os.path.join(tmpdir, 'bench.sock'), [target])
+            run('socket', UnixSocketHandler(level=DEBUG, resource=listener.path), workers, number, listener)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
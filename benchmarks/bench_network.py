@@ -0,0 +1,87 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark throughput and latency of `write` for NUMBER messages sent to a local TCP
+collector, comparing a new connection per message with NetworkHandler (pool of 1 and 4).
+
+Usage:
+    python benchmarks/bench_network.py [NUMBER]
+"""
+
+# standard libs
+import sys
+import time
+import socket
+import threading
+import socketserver
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.level import Level
+from logalpha.handler import Handler
+from logalpha.message import Message
+from logalpha.contrib.standard import DEBUG, INFO
+from logalpha.contrib.network import NetworkHandler
+
+
+class Discard(socketserver.StreamRequestHandler):
+    """Read and discard everything."""
+
+    def handle(self) -> None:
+        while self.rfile.read(65536):
+            pass
+
+
+@dataclass
+class ConnectHandler(Handler):
+    """Open a new connection for each message."""
+
+    level: Level = DEBUG
+    resource: tuple = None
+
+    def write(self, message: Message) -> None:
+        with socket.create_connection(self.resource) as sock:
+            sock.sendall(f'{message.content}\n'.encode())
+
+
+def run(name: str, handler: Handler, number: int) -> None:
+    """Write `number` messages and report throughput (until delivered) and latency of `write`."""
+    latency = []
+    start = time.perf_counter()
+    for i in range(number):
+        message = Message(level=INFO, content=f'message {i}')
+        begin = time.perf_counter()
+        handler.write(message)
+        latency.append(time.perf_counter() - begin)
+    if isinstance(handler, NetworkHandler):
+        handler.close()
+    elapsed = time.perf_counter() - start
+    latency.sort()
+    p50, p99 = (latency[int(len(latency) * q)] * 1e6 for q in (0.50, 0.99))
+    print(f'{name:<12} {number / elapsed:10,.0f} messages/s  '
+          f'p50={p50:8.1f}us  p99={p99:8.1f}us  max={latency[-1] * 1e6:10.1f}us')
+
+
+def main(number: int = 100_000) -> None:
+    """Run all cases."""
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Discard)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = server.server_address
+    run('connect', ConnectHandler(resource=address), min(number, 200))
+    for pool_size in (1, 4):
+        handler = NetworkHandler(level=DEBUG, resource=address, pool_size=pool_size, max_pending=number)
+        run(f'pool={pool_size}', handler, number)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,49 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""
+Benchmark the cost per message with 1, 2, and 4 StandardHandlers,
+with and without sharing the formatted output between handlers.
+
+Usage:
+    python benchmarks/bench_shared_format.py [NUMBER]
+"""
+
+# standard libs
+import io
+import sys
+import timeit
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.contrib.standard import StandardLogger, StandardHandler, DEBUG
+
+
+@dataclass
+class UnsharedHandler(StandardHandler):
+    """Always calls format."""
+
+    format_fields = None
+
+
+def main(number: int = 100_000) -> None:
+    """Run benchmarks and print cost per message in microseconds."""
+    log = StandardLogger(__name__)
+    for cls in (UnsharedHandler, StandardHandler):
+        for count in (1, 2, 4):
+            StandardLogger.handlers.clear()
+            StandardLogger.handlers.extend([cls(level=DEBUG, resource=io.StringIO(), buffered=True)
+                                            for _ in range(count)])
+            elapsed = min(timeit.repeat(lambda: log.info('message'), number=number, repeat=5))
+            print(f'{cls.__name__:<16} handlers={count}  {elapsed / number * 1e6:6.2f} us/message')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
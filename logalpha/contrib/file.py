@@ -0,0 +1,277 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages to files with optional rotation."""
+
+# type annotations
+from typing import BinaryIO, ClassVar, Optional, Tuple
+
+# standard libs
+import os
+import re
+import gzip
+import time
+import shutil
+import atexit
+import threading
+from queue import Queue
+from datetime import datetime
+from dataclasses import dataclass
+
+# internal libs
+from ..level import Level, WARNING
+from ..message import Message
+from ..handler import TemplateHandler, _BUFFERED  # noqa: protected (flushed at exit)
+
+
+@dataclass
+class FileHandler(TemplateHandler):
+    """
+    Append formatted messages to the file at `path`.
+
+    The file is opened once in binary append mode. Each line (or batch, if `buffered`)
+    is encoded and published with a single `write`. Writes are `locked` by default.
+
+    Lines collect in the file's write buffer (of `buffer_size` bytes) and reach the file
+    when it fills up, for messages at or above `flush_level`, on :meth:`flush` or
+    :meth:`close`, and at exit. If `buffered`, the file is also flushed after each batch
+    (see :class:`~logalpha.handler.StreamHandler`), which bounds the delay to `flush_interval`.
+
+    Example:
+        >>> handler = FileHandler(path='app.log', template='{timestamp} {level:<8} {content}')
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (`BinaryIO`):
+            The open file (opened automatically from `path`).
+        path (str):
+            Path of the file.
+        encoding (str):
+            Text encoding (default: 'utf-8').
+        buffer_size (int):
+            Size of the file's write buffer in bytes (default: 65536).
+    """
+
+    level: Level = WARNING
+    resource: BinaryIO = None
+    locked: bool = True
+
+    path: str = None
+    encoding: str = 'utf-8'
+    buffer_size: int = 65536
+
+    # output depends on the compiled template only
+    format_fields: ClassVar[Tuple[str, ...]] = ('compiled',)
+
+    def __post_init__(self) -> None:
+        """Validate `path` and open the file."""
+        if self.path is None:
+            raise ValueError(f'{self.__class__.__name__} requires a path')
+        self._open()
+        _BUFFERED[id(self)] = self
+
+    def _open(self) -> None:
+        """Open (or create) the file for appending."""
+        self.resource = open(self.path, mode='ab', buffering=self.buffer_size)
+
+    def write(self, message: Message) -> None:
+        """Publish `message` to the file, flushing it if the `level` is at least `flush_level`."""
+        super().write(message)
+        if not self.buffered and message.level.value >= self.flush_level.value:
+            self.flush()
+
+    def _publish(self, text: str) -> None:
+        """Encode and write complete lines of `text` with a single `write` (flushing at the end of a batch)."""
+        self.resource.write(text.encode(self.encoding))
+        if self.buffered:
+            self.resource.flush()
+
+    def flush(self) -> None:
+        """Publish any buffered lines and flush the file."""
+        self._acquire()
+        try:
+            self._flush()
+            self.resource.flush()
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        """Publish any buffered lines and close the file."""
+        self.flush()
+        self.resource.close()
+        _BUFFERED.pop(id(self), None)
+
+
+@dataclass
+class RotatingFileHandler(FileHandler):
+    """
+    Append formatted messages to the file at `path`, moving it aside once it reaches
+    `max_bytes` and starting a new file.
+
+    Rotated files are renamed with a timestamp suffix (e.g., ``app.log.20201012-204810-555000``).
+    Compressing them (if `compress`) and removing all but the newest `backup_count`
+    happens on a background thread; publishing messages never waits for either.
+
+    The size of the file is read once when it is opened and counted from there on,
+    so checking for rotation costs one comparison per write.
+
+    Example:
+        >>> handler = RotatingFileHandler(path='app.log', max_bytes=2**20, backup_count=10)
+
+    Attributes:
+        max_bytes (int):
+            Rotate before the file would exceed this size (default: 10 MiB, None to disable).
+        backup_count (int):
+            Number of rotated files to keep (default: 5, None to keep all).
+        compress (bool):
+            Compress rotated files with gzip (default: True).
+    """
+
+    max_bytes: Optional[int] = 10 * 2**20
+    backup_count: Optional[int] = 5
+    compress: bool = True
+
+    format_fields: ClassVar[Tuple[str, ...]] = ('compiled',)
+
+    def _open(self) -> None:
+        """Open the file and compute when it should next be rotated."""
+        super()._open()
+        self._size = os.fstat(self.resource.fileno()).st_size
+        self._max_size = float('inf') if self.max_bytes is None else self.max_bytes
+        self._rollover_at = self._next_rollover()
+
+    def _next_rollover(self) -> Optional[float]:
+        """Time (seconds since the epoch) of the next scheduled rotation (None if by size only)."""
+        return None
+
+    def _publish(self, text: str) -> None:
+        """Encode and write complete lines of `text`, rotating the file first if needed."""
+        data = text.encode(self.encoding)
+        if ((self._size and self._size + len(data) > self._max_size) or
+                (self._rollover_at is not None and time.time() >= self._rollover_at)):
+            self.rotate()
+        self.resource.write(data)
+        if self.buffered:
+            self.resource.flush()
+        self._size += len(data)
+
+    def rotate(self) -> None:
+        """Move the current file aside and open a new one (caller must hold the lock)."""
+        self.resource.close()
+        target = _rotated_name(self.path)
+        os.rename(self.path, target)
+        self._open()
+        _schedule(target if self.compress else None, self.path, self.backup_count)
+
+
+@dataclass
+class TimedRotatingFileHandler(RotatingFileHandler):
+    """
+    Append formatted messages to the file at `path`, rotating it every `interval`
+    seconds (and also by size, if `max_bytes` is given).
+
+    Rotation happens at multiples of `interval` in local time, so the default
+    rotates at midnight and ``interval=3600`` rotates on the hour. The time of the
+    next rotation is computed in advance; checking costs one clock read per write.
+
+    Example:
+        >>> handler = TimedRotatingFileHandler(path='app.log', backup_count=30)
+
+    Attributes:
+        interval (int):
+            Seconds between rotations (default: 86400).
+        max_bytes (int):
+            Also rotate before the file would exceed this size (default: None).
+        backup_count (int):
+            Number of rotated files to keep (default: 7, None to keep all).
+    """
+
+    max_bytes: Optional[int] = None
+    backup_count: Optional[int] = 7
+    interval: int = 86400
+
+    format_fields: ClassVar[Tuple[str, ...]] = ('compiled',)
+
+    def _next_rollover(self) -> float:
+        """Next multiple of `interval` in local time."""
+        now = time.time()
+        offset = datetime.fromtimestamp(now).astimezone().utcoffset().total_seconds()
+        return ((now + offset) // self.interval + 1) * self.interval - offset
+
+
+def _rotated_name(path: str) -> str:
+    """New name for `path` with a timestamp suffix (these sort in the order they are created)."""
+    while True:
+        name = f'{path}.{datetime.now().strftime("%Y%m%d-%H%M%S-%f")}'
+        if not os.path.exists(name) and not os.path.exists(f'{name}.gz'):
+            return name
+
+
+def _compress(path: str) -> None:
+    """Replace the file at `path` with a gzip-compressed copy."""
+    with open(path, mode='rb') as source, gzip.open(f'{path}.gz.tmp', mode='wb') as target:
+        shutil.copyfileobj(source, target)
+    os.rename(f'{path}.gz.tmp', f'{path}.gz')
+    os.remove(path)
+
+
+def _prune(path: str, backup_count: Optional[int]) -> None:
+    """Remove all but the newest `backup_count` rotated files for `path`."""
+    if backup_count is not None:
+        directory, base = os.path.split(path)
+        pattern = re.compile(re.escape(base) + r'\.(\d{8}-\d{6}-\d{6})(\.gz)?')  # see _rotated_name
+        rotated = []
+        for name in os.listdir(directory or '.'):
+            match = pattern.fullmatch(name)
+            if match:
+                rotated.append((match.group(1), name))
+        rotated.sort()
+        for _, name in rotated[:max(len(rotated) - backup_count, 0)]:
+            os.remove(os.path.join(directory, name))
+
+
+# rotated files waiting to be compressed and pruned
+_JOBS: Queue = Queue()
+_WORKER: threading.Thread = None
+_WORKER_LOCK: threading.Lock = threading.Lock()
+
+
+def _run_jobs() -> None:
+    """Compress and prune rotated files in the background."""
+    while True:
+        target, path, backup_count = _JOBS.get()
+        try:
+            if target is not None:
+                _compress(target)
+            _prune(path, backup_count)
+        except OSError:
+            pass  # files removed or replaced by someone else
+        finally:
+            _JOBS.task_done()
+
+
+def _schedule(target: Optional[str], path: str, backup_count: Optional[int]) -> None:
+    """Compress `target` (if given) and prune rotated files for `path` in the background."""
+    global _WORKER
+    if _WORKER is None:
+        with _WORKER_LOCK:
+            if _WORKER is None:
+                _WORKER = threading.Thread(target=_run_jobs, name='logalpha-rotate', daemon=True)
+                _WORKER.start()
+    _JOBS.put((target, path, backup_count))
+
+
+@atexit.register
+def _finish_jobs() -> None:
+    """Wait for pending compression at exit."""
+    if _WORKER is not None:
+        _JOBS.join()
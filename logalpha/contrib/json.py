@@ -0,0 +1,116 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages as JSON Lines."""
+
+# type annotations
+from typing import Any, Callable, ClassVar, Dict, IO, Optional, Tuple
+
+# standard libs
+import sys
+import json
+import functools
+import dataclasses
+from dataclasses import dataclass
+
+# internal libs
+from ..level import Level, WARNING
+from ..message import Message
+from ..timestamp import TimestampFormat, ISO8601
+from ..handler import StreamHandler
+
+# external libs
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# converts a message to a dictionary of JSON values
+Encoder = Callable[[Message], Dict[str, Any]]
+
+
+def _dumps_orjson(value: Dict[str, Any]) -> str:
+    """Serialize `value` with :mod:`orjson`."""
+    return orjson.dumps(value, default=str).decode()
+
+
+#: Serialize a dictionary as compact JSON (with :mod:`orjson` if installed, otherwise :mod:`json`).
+dumps: Callable[[Dict[str, Any]], str] = (
+    _dumps_orjson if orjson is not None else
+    functools.partial(json.dumps, default=str, ensure_ascii=False, separators=(',', ':')))
+
+
+@functools.lru_cache(maxsize=None)
+def compile_encoder(cls: type, timestamp_format: Optional[TimestampFormat] = None) -> Encoder:
+    """
+    Generate a function that converts a `cls` instance to a dictionary for JSON.
+
+    The dictionary has all fields of `cls` (a :class:`~dataclasses.dataclass`) in order,
+    read directly without the recursion and copying of :func:`dataclasses.asdict`.
+    The `level` is its name and the `timestamp` (if any) is formatted by `timestamp_format`
+    (if given). Generated functions are cached by `cls` and `timestamp_format`.
+
+    Example:
+        >>> encoder = compile_encoder(StandardMessage, ISO8601)
+        >>> encoder(message)
+        {'level': 'INFO', 'content': 'Hello, world!', 'timestamp': '2020-10-12T20:48:10.555-04:00', ...}
+    """
+    items = []
+    for field in dataclasses.fields(cls):
+        if field.name == 'level':
+            value = 'message.level.name'
+        elif field.name == 'timestamp' and timestamp_format is not None:
+            value = 'timestamp_format(message.timestamp)'
+        else:
+            value = f'message.{field.name}'
+        items.append(f'{field.name!r}: {value}')
+    source = (f'def encode(message):\n'
+              f'    return {{{", ".join(items)}}}\n')
+    namespace = {'timestamp_format': timestamp_format}
+    exec(source, namespace)  # noqa: exec (generated from field names only)
+    return namespace['encode']
+
+
+@dataclass
+class JSONHandler(StreamHandler):
+    """
+    Publish messages as JSON Lines, one object per message with all of its fields.
+
+    Serialization uses :mod:`orjson` if it is installed (``pip install logalpha[json]``)
+    and the standard :mod:`json` module otherwise. Values that are not JSON types
+    (e.g., a `content` object) are converted with :class:`str`.
+
+    Example:
+        >>> handler = JSONHandler(resource=open('app.jsonl', mode='a'))
+        >>> handler.format(message)
+        '{"level":"INFO","content":"Hello, world!","timestamp":"2020-10-12T20:48:10.555-04:00",...}'
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (`IO`):
+            File-like resource to write to (default: :data:`sys.stderr`).
+        timestamp_format (:class:`~logalpha.timestamp.TimestampFormat`):
+            Formats the timestamp (default: :data:`~logalpha.timestamp.ISO8601`,
+            None for the original value as a string or integer).
+    """
+
+    level: Level = WARNING
+    resource: IO = sys.stderr
+    timestamp_format: Optional[TimestampFormat] = ISO8601
+
+    # output depends on the timestamp format only
+    format_fields: ClassVar[Tuple[str, ...]] = ('timestamp_format',)
+
+    def format(self, message: Message) -> str:
+        """Serialize `message` as a single line of JSON."""
+        return dumps(compile_encoder(type(message), self.timestamp_format)(message))
@@ -0,0 +1,97 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Retain recent messages in memory."""
+
+# type annotations
+from typing import Deque
+
+# standard libs
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+# internal libs
+from ..level import Level, DEBUG, ERROR
+from ..message import Message
+from ..handler import Handler
+
+
+@dataclass
+class MemoryHandler(Handler):
+    """
+    Keep the last `capacity` messages and publish them to `target` when something fails.
+
+    Messages are retained as-is (nothing is formatted) until a message at or above
+    `trigger_level` arrives; then all retained messages, including that one, are
+    published to `target` in order. Use this together with a regular handler to get
+    full context (e.g., everything at DEBUG) only for failures.
+
+    Example:
+        >>> handler = MemoryHandler(target=StandardHandler(), capacity=500)
+        >>> StandardLogger.handlers.extend([StandardHandler(level=INFO), handler])
+
+        >>> OkayLogger.handlers.append(MemoryHandler(level=OK, target=OkayHandler(), trigger_level=ERR))
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            Retain messages at or above this level (default: :data:`DEBUG`).
+        resource (:class:`~collections.deque`):
+            The retained messages (default: new deque with `capacity`).
+        target (:class:`~logalpha.handler.Handler`):
+            The handler to publish retained messages to.
+        capacity (int):
+            Number of messages to retain (default: 1000).
+        trigger_level (:class:`~logalpha.level.Level`):
+            Publish retained messages for any message at or above this level
+            (default: :data:`ERROR`).
+    """
+
+    level: Level = DEBUG
+    resource: Deque[Message] = None
+    target: Handler = None
+
+    capacity: int = 1000
+    trigger_level: Level = ERROR
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate arguments and create the deque."""
+        if self.target is None:
+            raise ValueError('MemoryHandler requires a target')
+        if self.resource is None:
+            self.resource = deque(maxlen=self.capacity)
+
+    def write(self, message: Message) -> None:
+        """Retain `message` and publish all retained messages if it is at or above `trigger_level`."""
+        self.resource.append(message)
+        if message.level.value >= self.trigger_level.value:
+            self.dump()
+
+    def dump(self) -> None:
+        """Publish all retained messages to `target` (oldest first) and forget them."""
+        with self._lock:
+            while True:
+                try:
+                    message = self.resource.popleft()
+                except IndexError:
+                    break
+                self.target.write(message)
+
+    def format(self, message: Message) -> Message:
+        """Messages are retained as-is, formatting is left to `target`."""
+        return message
+
+    def flush(self) -> None:
+        """Flush `target` (retained messages are only published by :meth:`dump`)."""
+        if hasattr(self.target, 'flush'):
+            self.target.flush()
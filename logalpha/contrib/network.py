@@ -0,0 +1,420 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages to a remote collector over TCP."""
+
+# type annotations
+from typing import BinaryIO, List, Optional, Tuple
+
+# standard libs
+import os
+import time
+import queue
+import random
+import socket
+import struct
+import atexit
+import weakref
+import threading
+import dataclasses
+from dataclasses import dataclass, field
+
+# internal libs
+from ..level import Level, WARNING
+from ..message import Message
+from ..handler import Handler
+
+
+# length prefix for frames (and for records in the spill file)
+_HEADER = struct.Struct('!I')
+
+# tells a sender thread to stop
+_STOP = object()
+
+
+@dataclass
+class NetworkStats:
+    """
+    Delivery counters for a :class:`NetworkHandler` (see :attr:`NetworkHandler.stats`).
+
+    Attributes:
+        sent (int):
+            Number of messages sent to the collector (including replayed messages).
+        batches (int):
+            Number of batches sent.
+        retries (int):
+            Number of failed attempts to connect or send.
+        spilled (int):
+            Number of messages written to the spill file.
+        replayed (int):
+            Number of messages sent from the spill file.
+        dropped (int):
+            Number of messages lost (queue full and no spill file, or spill file full).
+    """
+
+    sent: int = 0
+    batches: int = 0
+    retries: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    dropped: int = 0
+
+
+class _Connection:
+    """A pooled connection and its retry state (owned by one sender thread)."""
+
+    def __init__(self) -> None:
+        self.socket: Optional[socket.socket] = None
+        self.attempts: int = 0
+        self.retry_at: float = 0.0
+        self.down_since: Optional[float] = None
+
+    def close(self) -> None:
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+
+@dataclass
+class NetworkHandler(Handler):
+    """
+    Send messages to a remote collector over a small pool of persistent TCP connections.
+
+    Callers never touch the network: :meth:`write` formats the message and puts it on a
+    bounded queue. Each of `pool_size` sender threads owns one connection and sends
+    whatever has accumulated on the queue (up to `batch_size` messages or `batch_bytes`)
+    in a single ``sendall``, so batches grow with the load.
+
+    Each message is one frame, either terminated by a newline (``framing='line'``) or
+    with a 4-byte big-endian length prefix (``framing='length'``). With line framing,
+    backslashes and newlines within a message are escaped (as ``\\\\`` and ``\\n``) so that
+    multi-line messages (e.g., tracebacks) remain one frame. A failed batch is
+    sent again on a new connection after an exponential backoff (from `retry_initial`
+    up to `retry_max` seconds, with jitter); delivery is at least once.
+
+    If `spill_path` is given, messages are appended to that file instead of being lost:
+    by callers if the queue is full and by sender threads once the collector has been
+    unreachable for `spill_after` seconds (or at exit). Spilled messages are sent again
+    (oldest first) as soon as the collector is back, including those left by a previous
+    run. Otherwise such messages are dropped. See :attr:`stats` for the counts.
+
+    Example:
+        >>> handler = NetworkHandler(resource=('logs.example.com', 5170), spill_path='/var/tmp/app.spill')
+        >>> StandardLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (tuple):
+            Address (host, port) of the collector.
+        framing (str):
+            Either 'line' or 'length' (default: 'line').
+        encoding (str):
+            Text encoding (default: 'utf-8').
+        pool_size (int):
+            Number of connections and sender threads (default: 2).
+        batch_size (int):
+            Most messages per batch (default: 1024).
+        batch_bytes (int):
+            Stop adding messages to a batch once it reaches this size (default: 65536).
+        max_pending (int):
+            Capacity of the queue in messages (default: 10000).
+        timeout (float):
+            Seconds to wait for connecting or sending (default: 5.0).
+        retry_initial (float):
+            Delay in seconds after the first failure (default: 0.1).
+        retry_max (float):
+            Longest delay in seconds between attempts (default: 30.0).
+        spill_path (str):
+            File for messages that cannot be sent (default: None).
+        spill_after (float):
+            Seconds the collector must be unreachable before spilling (default: 10.0).
+        spill_bytes (int):
+            Largest size of the spill file (default: 100 MiB).
+    """
+
+    level: Level = WARNING
+    resource: Tuple[str, int] = None
+
+    framing: str = 'line'
+    encoding: str = 'utf-8'
+    pool_size: int = 2
+    batch_size: int = 1024
+    batch_bytes: int = 65536
+    max_pending: int = 10000
+    timeout: float = 5.0
+    retry_initial: float = 0.1
+    retry_max: float = 30.0
+
+    spill_path: Optional[str] = None
+    spill_after: float = 10.0
+    spill_bytes: int = 100 * 2**20
+
+    _queue: queue.Queue = field(default=None, init=False, repr=False, compare=False)
+    _threads: List[threading.Thread] = field(default_factory=list, init=False, repr=False, compare=False)
+    _stopping: threading.Event = field(default_factory=threading.Event, init=False, repr=False, compare=False)
+    _pid: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _stats: NetworkStats = field(default_factory=NetworkStats, init=False, repr=False, compare=False)
+    _stats_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _spill: Optional[BinaryIO] = field(default=None, init=False, repr=False, compare=False)
+    _spill_size: int = field(default=0, init=False, repr=False, compare=False)
+    _replay_offset: int = field(default=0, init=False, repr=False, compare=False)
+    _replaying: bool = field(default=False, init=False, repr=False, compare=False)
+    _spill_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate arguments and open the spill file (if any)."""
+        if self.resource is None:
+            raise ValueError(f'{self.__class__.__name__} requires an address')
+        if self.framing not in ('line', 'length'):
+            raise ValueError(f'Unknown framing: {self.framing!r}')
+        if self.spill_path is not None:
+            self._spill = open(self.spill_path, mode='ab')
+            self._spill_size = self._spill.tell()  # left over from a previous run
+        _HANDLERS[id(self)] = self
+
+    @property
+    def stats(self) -> NetworkStats:
+        """Copy of the current delivery counters."""
+        with self._stats_lock:
+            return dataclasses.replace(self._stats)
+
+    def _count(self, **counts: int) -> None:
+        """Add to the delivery counters."""
+        with self._stats_lock:
+            for name, count in counts.items():
+                setattr(self._stats, name, getattr(self._stats, name) + count)
+
+    def write(self, message: Message) -> None:
+        """Put the formatted `message` on the queue (spill or drop it if the queue is full)."""
+        data = self.format_cached(message)
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self._spill_or_drop([data])
+
+    def format(self, message: Message) -> str:
+        """Returns :data:`message.content`."""
+        return str(message.content)
+
+    def _start(self) -> None:
+        """Create the queue and start the sender threads (again, in a forked process)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(self.max_pending)
+            self._stopping.clear()
+            self._threads = [threading.Thread(target=self._run, name=f'logalpha-network-{i}', daemon=True)
+                             for i in range(self.pool_size)]
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        """Send batches from the queue until stopped."""
+        connection = _Connection()
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch or self._spill_size > self._replay_offset:
+                    try:
+                        self._deliver(connection, batch)
+                    except Exception:  # noqa: broad (one bad record must not stop delivery for good)
+                        connection.close()
+                        self._count(dropped=len(batch))
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _next_batch(self) -> Tuple[List[bytes], bool]:
+        """Wait for messages and take as many as fit in one batch (and whether to stop after)."""
+        # poll while spilled messages are waiting so they are replayed without new messages
+        try:
+            item = self._queue.get(timeout=self.retry_initial if self._spill_size else None)
+        except queue.Empty:
+            return [], False
+        batch, size = [], 0
+        while item is not _STOP:
+            batch.append(item)
+            size += len(item)
+            if len(batch) >= self.batch_size or size >= self.batch_bytes:
+                return batch, False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _deliver(self, connection: _Connection, batch: List[bytes]) -> None:
+        """Send `batch` (retrying with backoff) followed by any spilled messages."""
+        while True:
+            now = time.monotonic()
+            if now >= connection.retry_at:
+                try:
+                    self._send(connection, batch)
+                except OSError:
+                    self._failed(connection, now)
+                else:
+                    self._count(sent=len(batch), batches=bool(batch))
+                    try:
+                        self._replay(connection)
+                    except OSError:
+                        self._failed(connection, time.monotonic())
+                    return
+            if not batch:
+                return  # only here to replay
+            if self._spill is not None and (self._stopping.is_set() or now - connection.down_since >= self.spill_after):
+                self._spill_or_drop(batch)
+                return
+            if self._stopping.is_set():
+                self._count(dropped=len(batch))
+                return
+            self._stopping.wait(max(connection.retry_at - time.monotonic(), 0))
+
+    def _failed(self, connection: _Connection, now: float) -> None:
+        """Close the connection and schedule the next attempt."""
+        connection.close()
+        connection.attempts += 1
+        delay = min(self.retry_initial * 2 ** (connection.attempts - 1), self.retry_max)
+        connection.retry_at = now + random.uniform(delay / 2, delay)
+        if connection.down_since is None:
+            connection.down_since = now
+        self._count(retries=1)
+
+    def _send(self, connection: _Connection, batch: List[bytes]) -> None:
+        """Frame and send `batch` on the connection (connecting first if needed)."""
+        if connection.socket is None:
+            connection.socket = socket.create_connection(self.resource, timeout=self.timeout)
+            connection.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.framing == 'line':
+            data = b''.join([item.replace(b'\\', b'\\\\').replace(b'\n', b'\\n') + b'\n' for item in batch])
+        else:
+            data = b''.join([_HEADER.pack(len(item)) + item for item in batch])
+        if data:
+            connection.socket.sendall(data)
+        connection.attempts, connection.retry_at, connection.down_since = 0, 0.0, None
+
+    def _spill_or_drop(self, batch: List[bytes]) -> None:
+        """Append `batch` to the spill file (or drop it if there is none or it is full)."""
+        if self._spill is None:
+            self._count(dropped=len(batch))
+            return
+        data = b''.join([_HEADER.pack(len(item)) + item for item in batch])
+        with self._spill_lock:
+            if self._spill.closed or self._spill_size + len(data) > self.spill_bytes:
+                self._count(dropped=len(batch))
+                return
+            self._spill.write(data)
+            self._spill.flush()
+            self._spill_size += len(data)
+        self._count(spilled=len(batch))
+
+    def _replay(self, connection: _Connection) -> None:
+        """Send spilled messages in batches (on one sender thread at a time)."""
+        if self._spill_size <= self._replay_offset:
+            return
+        with self._spill_lock:
+            if self._replaying:
+                return
+            self._replaying = True
+        try:
+            with open(self.spill_path, mode='rb') as stream:
+                while True:
+                    with self._spill_lock:
+                        start, stop = self._replay_offset, self._spill_size
+                        if start >= stop:
+                            self._spill.truncate(0)  # everything was sent, start over
+                            self._spill_size = self._replay_offset = 0
+                            return
+                    stream.seek(start)
+                    batch, offset = [], start
+                    while offset < stop and len(batch) < self.batch_size and offset - start < self.batch_bytes:
+                        header = stream.read(_HEADER.size)
+                        item = None
+                        if len(header) == _HEADER.size:
+                            length, = _HEADER.unpack(header)
+                            item = stream.read(length)
+                        if item is None or len(item) < length:
+                            self._truncate_spill(offset)  # e.g., a process was killed while writing
+                            break
+                        batch.append(item)
+                        offset += _HEADER.size + length
+                    if batch:
+                        self._send(connection, batch)
+                        self._count(sent=len(batch), batches=1, replayed=len(batch))
+                    with self._spill_lock:
+                        self._replay_offset = offset
+        finally:
+            with self._spill_lock:
+                self._replaying = False
+
+    def _truncate_spill(self, offset: int) -> None:
+        """Discard the incomplete record at `offset` (and anything after it) from the spill file."""
+        with self._spill_lock:
+            if self._spill_size > offset:
+                self._spill.truncate(offset)
+                self._spill_size = offset
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued messages have been sent, spilled, or dropped
+        (at most `timeout` seconds, or forever if None). Returns False on timeout.
+        """
+        if self._pid != os.getpid():
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """
+        Send queued messages (waiting at most `timeout` seconds), then spill or drop
+        whatever is left, stop the sender threads, and close the spill file.
+        """
+        if self._pid == os.getpid():
+            self.flush(self.timeout)
+            self._stopping.set()  # senders spill or drop instead of retrying
+            for _ in self._threads:
+                self._queue.put(_STOP)
+            for thread in self._threads:
+                thread.join()
+            self._pid = None
+        if self._spill is not None:
+            with self._spill_lock:
+                self._spill.close()
+        _HANDLERS.pop(id(self), None)
+
+
+# open network handlers, closed at exit
+_HANDLERS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+@atexit.register
+def _close_all() -> None:
+    """Send (or spill) queued messages at exit."""
+    for handler in list(_HANDLERS.values()):
+        try:
+            handler.close()
+        except (OSError, ValueError):
+            pass  # spill file has gone away
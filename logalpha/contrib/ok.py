@@ -16,13 +16,12 @@ from typing import List, IO, Callable
 
 # standard libs
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # internal libs
-from ..color import Color, ANSI_RESET
+from ..color import Color
 from ..level import Level
-from ..message import Message
-from ..handler import StreamHandler
+from ..handler import TemplateHandler
 from ..logger import Logger
 
 
@@ -49,7 +48,7 @@ ERR = OkayLogger.levels[1]  #:
 
 
 @dataclass
-class OkayHandler(StreamHandler):
+class OkayHandler(TemplateHandler):
     """
     Writes to <stderr> by default.
     Message format includes the colorized level and the text.
@@ -59,12 +58,15 @@ class OkayHandler(StreamHandler):
             The level for this handler (default: :data:`OK`).
         resource (`IO`):
             File-like resource to write to (default: :data:`sys.stderr`).
+        flush_level (:class:`~logalpha.level.Level`):
+            In `buffered` mode, flush immediately at this level (default: :data:`ERR`).
+        template (str):
+            Message format (default: ``'{level:<3} {content}'``).
     """
 
     level: Level = OK
     resource: IO = sys.stderr
-
-    def format(self, message: Message) -> str:
-        """Format the message."""
-        color = OkayLogger.colors[message.level.value].foreground
-        return f'{color}{message.level.name:<3}{ANSI_RESET} {message.content}'
+    flush_level: Level = ERR
+    template: str = '{level:<3} {content}'
+    levels: List[Level] = field(default_factory=lambda: OkayLogger.levels)
+    colors: List[Color] = field(default_factory=lambda: OkayLogger.colors)
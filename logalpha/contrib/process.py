@@ -0,0 +1,249 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages from other processes."""
+
+# type annotations
+from typing import Any, List, Tuple, Type, Optional
+
+# standard libs
+import os
+import pickle
+import select
+import socket
+import struct
+import functools
+import threading
+import dataclasses
+import socketserver
+import multiprocessing
+from queue import Queue
+from dataclasses import dataclass, field
+
+# internal libs
+from ..level import Level, WARNING
+from ..message import Message
+from ..handler import Handler
+from .queue import QueueListener
+
+
+# a message as its class and the values of its fields
+Record = Tuple[Type[Message], Tuple[Any, ...]]
+
+# length prefix for records sent over a socket
+_HEADER = struct.Struct('!I')
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Names of the fields passed to construct `cls`."""
+    return tuple(item.name for item in dataclasses.fields(cls) if item.init)
+
+
+def encode(message: Message) -> Record:
+    """
+    Compact form of `message` to send to another process: its class and the values
+    of its fields, in order (without any formatting cached on the message).
+
+    Example:
+        >>> encode(Message(level=INFO, content='Hello, world!'))
+        (<class 'logalpha.message.Message'>, (Level(name='INFO', value=1), 'Hello, world!'))
+    """
+    cls = type(message)
+    return cls, tuple(getattr(message, name) for name in _field_names(cls))
+
+
+def decode(record: Record) -> Message:
+    """Construct the message from a `record` created by :func:`encode`."""
+    cls, values = record
+    return cls(*values)
+
+
+@dataclass
+class ProcessHandler(Handler):
+    """
+    Send messages to a :class:`ProcessListener` in another process over a
+    :mod:`multiprocessing` queue. Messages are pickled on the queue's feeder
+    thread, so the caller only pays for :func:`encode`.
+
+    Example:
+        >>> def init(queue):
+        ...     StandardLogger.handlers.replace([ProcessHandler(resource=queue)])
+        >>> listener = ProcessListener([StandardHandler()])
+        >>> listener.start()
+        >>> pool = Pool(8, initializer=init, initargs=(listener.queue,))
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (:class:`~multiprocessing.JoinableQueue`):
+            The queue of the :class:`ProcessListener`.
+    """
+
+    level: Level = WARNING
+    resource: Any = None
+
+    def write(self, message: Message) -> None:
+        """Put `message` on the queue."""
+        self.resource.put(self.format(message))
+
+    def format(self, message: Message) -> Record:
+        """Encode `message` (see :func:`encode`)."""
+        return encode(message)
+
+
+class ProcessListener(QueueListener):
+    """
+    Publish messages sent by any number of :class:`ProcessHandler` instances
+    to `handlers` on a worker thread of this process.
+
+    The `queue` (by default a new :class:`~multiprocessing.JoinableQueue`) must be
+    passed to the other processes when they are created (e.g., as an argument to
+    the `initializer` of a :class:`~multiprocessing.pool.Pool`).
+
+    Example:
+        >>> listener = ProcessListener([StandardHandler()])
+        >>> listener.start()
+        >>> listener.stop()  # drains the queue first
+    """
+
+    # the sentinel is pickled on the way through the queue, None is still None
+    sentinel: Any = None
+
+    def __init__(self, handlers: List[Handler], queue: Optional[Any] = None) -> None:
+        """Initialize with `handlers` and `queue`."""
+        super().__init__(multiprocessing.JoinableQueue() if queue is None else queue, handlers)
+
+    def handle(self, record: Record) -> None:
+        """Publish the message for `record` to all `handlers` if its `level` is sufficient."""
+        super().handle(decode(record))
+
+
+@dataclass
+class UnixSocketHandler(Handler):
+    """
+    Send messages to a :class:`UnixSocketListener` in another process over a
+    Unix domain socket. Each process connects on its first message, including
+    processes forked after the handler was created.
+
+    Records are pickled, so only listen on a path that other users cannot write to.
+
+    Example:
+        >>> StandardLogger.handlers.replace([UnixSocketHandler(resource='/run/user/1000/app.sock')])
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (str):
+            Path of the socket.
+    """
+
+    level: Level = WARNING
+    resource: str = None
+
+    _socket: Optional[socket.socket] = field(default=None, init=False, repr=False, compare=False)
+    _pid: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def write(self, message: Message) -> None:
+        """Send `message` with a length prefix."""
+        data = pickle.dumps(self.format(message), pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._connect()
+            self._socket.sendall(_HEADER.pack(len(data)) + data)
+
+    def format(self, message: Message) -> Record:
+        """Encode `message` (see :func:`encode`)."""
+        return encode(message)
+
+    def _connect(self) -> None:
+        """Open a new connection for this process (caller must hold the lock)."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.resource)
+        self._socket, self._pid = sock, os.getpid()
+
+    def close(self) -> None:
+        """Close the connection (if open in this process)."""
+        with self._lock:
+            if self._socket is not None and self._pid == os.getpid():
+                self._socket.close()
+            self._socket, self._pid = None, None
+
+
+class _RecordReader(socketserver.StreamRequestHandler):
+    """Put each record received on a connection on the server's `queue`."""
+
+    def handle(self) -> None:
+        while True:
+            header = self.rfile.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            self.server.queue.put(pickle.loads(self.rfile.read(_HEADER.unpack(header)[0])))
+
+
+class _RecordServer(socketserver.ThreadingUnixStreamServer):
+    """Accept connections from :class:`UnixSocketHandler` instances."""
+
+    # server_close() waits for each connection to be read to the end
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, path: str, queue: Queue) -> None:
+        self.queue = queue
+        super().__init__(path, _RecordReader)
+
+
+class UnixSocketListener(QueueListener):
+    """
+    Publish messages sent by any number of :class:`UnixSocketHandler` instances
+    to `handlers` on a worker thread of this process.
+
+    Each connection is read on its own thread; messages are published in the
+    order they arrive. :meth:`stop` waits for all connected processes to close
+    their connection (e.g., to exit) before draining the queue.
+
+    Example:
+        >>> listener = UnixSocketListener('/run/user/1000/app.sock', [StandardHandler()])
+        >>> listener.start()
+        >>> listener.stop()
+    """
+
+    path: str
+
+    def __init__(self, path: str, handlers: List[Handler]) -> None:
+        """Initialize with socket `path` and `handlers`."""
+        super().__init__(Queue(), handlers)
+        self.path = path
+        self._server = None
+
+    def start(self) -> None:
+        """Listen on `path` and start the worker thread."""
+        if self._server is None:
+            self._server = _RecordServer(self.path, self.queue)
+            threading.Thread(target=self._server.serve_forever, name='logalpha-socket', daemon=True).start()
+        super().start()
+
+    def stop(self) -> None:
+        """Stop listening, publish all received messages, and stop the worker thread."""
+        if self._server is not None:
+            self._server.shutdown()
+            # accept connections still waiting in the backlog so their messages are not lost
+            while select.select([self._server], [], [], 0)[0]:
+                self._server.handle_request()
+            self._server.server_close()
+            self._server = None
+            os.unlink(self.path)
+        super().stop()
+
+    def handle(self, record: Record) -> None:
+        """Publish the message for `record` to all `handlers` if its `level` is sufficient."""
+        super().handle(decode(record))
@@ -0,0 +1,236 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages from a background thread."""
+
+# type annotations
+from typing import Any, List, Optional
+
+# standard libs
+import sys
+import atexit
+import weakref
+import threading
+import traceback
+from queue import Queue, Full, Empty
+from collections import Counter
+from dataclasses import dataclass, field
+
+# internal libs
+from ..level import Level
+from ..message import Message
+from ..handler import Handler
+
+
+# overflow policies for a full queue
+BLOCK: str = 'block'              #: Wait for space on the queue.
+DROP_NEWEST: str = 'drop_newest'  #: Discard the incoming message.
+DROP_OLDEST: str = 'drop_oldest'  #: Discard the oldest queued message.
+DROP_BELOW: str = 'drop_below'    #: Discard incoming messages below `drop_level`, otherwise wait.
+OVERFLOW_POLICIES: List[str] = [BLOCK, DROP_NEWEST, DROP_OLDEST, DROP_BELOW]
+
+# put on the queue to stop the listener
+_SENTINEL = object()
+
+
+class QueueListener:
+    """
+    Drain messages from a `queue` into one or more `handlers` on a worker thread.
+
+    Example:
+        >>> listener = QueueListener(queue, [StandardHandler()])
+        >>> listener.start()
+        >>> listener.stop()  # drains the queue first
+    """
+
+    queue: Queue
+    handlers: List[Handler]
+
+    # put on the queue to stop the worker (compared by identity)
+    sentinel: Any = _SENTINEL
+
+    def __init__(self, queue: Queue, handlers: List[Handler]) -> None:
+        """Initialize with `queue` and `handlers`."""
+        self.queue = queue
+        self.handlers = handlers
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='logalpha-queue', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Publish all queued messages and stop the worker thread."""
+        if self._thread is not None:
+            self.queue.put(self.sentinel)
+            self._thread.join()
+            self._thread = None
+
+    def handle(self, message: Message) -> None:
+        """Publish `message` to all `handlers` if its `level` is sufficient for that handler."""
+        for handler in self.handlers:
+            if message.level.value >= handler.level.value:
+                try:
+                    handler.write(message)
+                except Exception:  # noqa: broad-except (the worker must survive)
+                    traceback.print_exc(file=sys.stderr)
+
+    def _run(self) -> None:
+        """Worker loop."""
+        while True:
+            message = self.queue.get()
+            if message is self.sentinel:
+                self.queue.task_done()
+                break
+            self.handle(message)
+            self.queue.task_done()
+        for handler in self.handlers:
+            if hasattr(handler, 'flush'):
+                handler.flush()
+
+
+@dataclass
+class QueueHandler(Handler):
+    """
+    Put messages on a bounded queue and publish them to `handler` on a worker thread.
+    The caller only pays for putting the message on the queue; formatting and I/O
+    happen on the worker.
+
+    When the queue is full the `overflow` policy decides what happens:
+    :data:`BLOCK` waits for space, :data:`DROP_NEWEST` discards the incoming message,
+    :data:`DROP_OLDEST` discards the oldest queued message, and :data:`DROP_BELOW`
+    discards incoming messages below `drop_level` but waits for all others.
+
+    Example:
+        >>> handler = QueueHandler(handler=StandardHandler(), overflow=DROP_OLDEST)
+        >>> StandardLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: same as `handler`).
+        resource (:class:`~queue.Queue`):
+            The queue (default: new queue with `maxsize`).
+        handler (:class:`~logalpha.handler.Handler`):
+            The handler to publish messages to on the worker thread.
+        maxsize (int):
+            Bound on the queue size (default: 10000).
+        overflow (str):
+            One of :data:`OVERFLOW_POLICIES` (default: :data:`BLOCK`).
+        drop_level (:class:`~logalpha.level.Level`):
+            Messages below this level are dropped with :data:`DROP_BELOW`.
+        dropped (:class:`~collections.Counter`):
+            Number of dropped messages by level name.
+        closed (bool):
+            Set by :meth:`close`.
+    """
+
+    level: Level = None
+    resource: Queue = None
+    handler: Handler = None
+
+    maxsize: int = 10000
+    overflow: str = BLOCK
+    drop_level: Optional[Level] = None
+
+    dropped: Counter = field(default_factory=Counter, init=False, compare=False)
+    closed: bool = field(default=False, init=False, repr=False, compare=False)
+    listener: QueueListener = field(default=None, init=False, repr=False, compare=False)
+
+    # held to check `closed` and put on the queue, so nothing is queued after the sentinel
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate arguments and start the listener."""
+        if self.handler is None:
+            raise ValueError('QueueHandler requires a handler')
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Unknown overflow policy \'{self.overflow}\' (expected one of {OVERFLOW_POLICIES})')
+        if self.overflow == DROP_BELOW and self.drop_level is None:
+            raise ValueError(f'Overflow policy \'{DROP_BELOW}\' requires drop_level')
+        if self.level is None:
+            self.level = self.handler.level
+        if self.resource is None:
+            self.resource = Queue(maxsize=self.maxsize)
+        self.listener = QueueListener(self.resource, [self.handler])
+        self.listener.start()
+        _ACTIVE[id(self)] = self
+
+    def write(self, message: Message) -> None:
+        """Put `message` on the queue (subject to the `overflow` policy)."""
+        with self._lock:
+            if not self.closed:
+                try:
+                    self.resource.put_nowait(message)
+                except Full:
+                    self._overflow(message)
+                return
+        self.listener.handle(message)
+
+    def _overflow(self, message: Message) -> None:
+        """Apply the `overflow` policy for `message` with a full queue (caller must hold the lock)."""
+        if self.overflow == BLOCK:
+            self.resource.put(message)
+        elif self.overflow == DROP_NEWEST:
+            self.dropped[message.level.name] += 1
+        elif self.overflow == DROP_BELOW:
+            if message.level.value < self.drop_level.value:
+                self.dropped[message.level.name] += 1
+            else:
+                self.resource.put(message)
+        else:
+            while True:
+                try:
+                    oldest = self.resource.get_nowait()
+                except Empty:
+                    pass
+                else:
+                    self.resource.task_done()
+                    self.dropped[oldest.level.name] += 1
+                try:
+                    self.resource.put_nowait(message)
+                    return
+                except Full:
+                    continue
+
+    def format(self, message: Message) -> Message:
+        """Messages are queued as-is, formatting is left to `handler`."""
+        return message
+
+    def flush(self) -> None:
+        """Wait for all currently queued messages to be published."""
+        if not self.closed:
+            self.resource.join()
+        if hasattr(self.handler, 'flush'):
+            self.handler.flush()
+
+    def close(self) -> None:
+        """
+        Publish all queued messages and stop the worker thread.
+        Any later messages are published directly on the calling thread.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        self.listener.stop()
+
+
+# running queue handlers to drain at exit
+_ACTIVE: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+@atexit.register
+def _close_all() -> None:
+    """Drain all queue handlers at exit."""
+    for handler in list(_ACTIVE.values()):
+        handler.close()
@@ -0,0 +1,171 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages to a memory-mapped circular buffer."""
+
+# type annotations
+from typing import ClassVar, Iterator, Optional, Tuple, Union
+
+# standard libs
+import os
+import sys
+import mmap
+import struct
+from dataclasses import dataclass
+
+# internal libs
+from ..level import Level, DEBUG
+from ..message import Message
+from ..handler import TemplateHandler
+
+
+# file header: magic, version, capacity, and offsets of the next record (head),
+# the oldest record of the previous lap (tail), and the end of the previous lap (end)
+_HEADER = struct.Struct('<4sIQQQQ')
+_OFFSETS = struct.Struct('<QQQ')
+_OFFSETS_AT = struct.calcsize('<4sIQ')
+_MAGIC = b'LARB'
+_VERSION = 1
+
+# length prefix for each record
+_LENGTH = struct.Struct('<I')
+
+
+@dataclass
+class RingBufferHandler(TemplateHandler):
+    """
+    Publish formatted messages to a fixed-size file used as a circular buffer.
+
+    The file is memory-mapped, so writing a message is a copy into memory without
+    any system call. The kernel writes the pages back to the file, which keeps the
+    most recent messages even if the process crashes. Once full, the oldest messages
+    are overwritten. Use :func:`read` (or ``python -m logalpha.contrib.ring FILE``)
+    to get the messages back in order.
+
+    Each message is one record: the output of :meth:`format` (encoded if `str`,
+    otherwise `bytes` are stored as-is) with a length prefix. Records are never split
+    across the end of the buffer. An existing file with the same `size` is reused
+    (appending after its last message).
+
+    Example:
+        >>> handler = RingBufferHandler(path='/dev/shm/app.ring', size=2**24)
+        >>> StandardLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`DEBUG`).
+        resource (:class:`mmap.mmap`):
+            The mapped file (opened automatically from `path`).
+        path (str):
+            Path of the file.
+        size (int):
+            Capacity in bytes for records (default: 1 MiB).
+        encoding (str):
+            Text encoding (default: 'utf-8').
+    """
+
+    level: Level = DEBUG
+    resource: mmap.mmap = None
+
+    path: str = None
+    size: int = 2**20
+    encoding: str = 'utf-8'
+
+    # output depends on the compiled template only
+    format_fields: ClassVar[Tuple[str, ...]] = ('compiled',)
+
+    def __post_init__(self) -> None:
+        """Validate arguments and map the file."""
+        if self.path is None:
+            raise ValueError(f'{self.__class__.__name__} requires a path')
+        if self.size < _LENGTH.size + 1:
+            raise ValueError(f'Size {self.size} is too small for any record')
+        self.resource, offsets = _open(self.path, self.size)
+        self._offsets = list(offsets)  # head, tail, end (updated in place)
+
+    def write(self, message: Message) -> None:
+        """Copy the formatted `message` into the buffer."""
+        data = self.format_cached(message)
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        with self._lock:
+            self._append(data[:self.size - _LENGTH.size])
+
+    def _append(self, data: bytes) -> None:
+        """Write `data` as the next record (caller must hold the lock)."""
+        buffer, start = self.resource, _HEADER.size
+        offsets = self._offsets
+        head, tail, end = offsets
+        length = _LENGTH.size + len(data)
+        if head + length > self.size:
+            head, tail, end = 0, 0, head  # wrap around, records so far become the previous lap
+        while tail < end and tail < head + length:  # discard records about to be overwritten
+            tail += _LENGTH.size + _LENGTH.unpack_from(buffer, start + tail)[0]
+        _OFFSETS.pack_into(buffer, _OFFSETS_AT, head, tail, end)
+        _LENGTH.pack_into(buffer, start + head, len(data))
+        buffer[start + head + _LENGTH.size:start + head + length] = data
+        offsets[:] = head + length, tail, end
+        _OFFSETS.pack_into(buffer, _OFFSETS_AT, head + length, tail, end)
+
+    def flush(self) -> None:
+        """Write changes back to the file now (not needed to survive a crash of the process)."""
+        self.resource.flush()
+
+    def close(self) -> None:
+        """Write changes back to the file and unmap it."""
+        self.resource.flush()
+        self.resource.close()
+
+
+def _open(path: str, size: int) -> Tuple[mmap.mmap, Tuple[int, int, int]]:
+    """Map the file at `path` (creating or resetting it unless it is valid with the same `size`)."""
+    with open(path, mode='a+b') as stream:
+        stream.seek(0)
+        header = stream.read(_HEADER.size)
+        valid = (len(header) == _HEADER.size and header[:4] == _MAGIC and
+                 _HEADER.unpack(header)[1:3] == (_VERSION, size) and
+                 os.fstat(stream.fileno()).st_size == _HEADER.size + size)
+        if not valid:
+            stream.truncate(0)
+            stream.write(_HEADER.pack(_MAGIC, _VERSION, size, 0, 0, 0))
+            stream.truncate(_HEADER.size + size)
+            stream.flush()
+        buffer = mmap.mmap(stream.fileno(), _HEADER.size + size)
+    return buffer, _OFFSETS.unpack_from(buffer, _OFFSETS_AT)
+
+
+def read(path: str, encoding: Optional[str] = 'utf-8') -> Iterator[Union[str, bytes]]:
+    """
+    Records from a :class:`RingBufferHandler` file, oldest first.
+    Records are decoded with `encoding` (if not None).
+
+    Example:
+        >>> for line in read('/dev/shm/app.ring'):
+        ...     print(line)
+    """
+    with open(path, mode='rb') as stream:
+        buffer = stream.read()
+    magic, version, size, head, tail, end = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f'Not a ring buffer: {path}')
+    data = memoryview(buffer)[_HEADER.size:]
+    for start, stop in ((tail, end), (0, head)):
+        offset = start
+        while offset < stop:
+            length, = _LENGTH.unpack_from(data, offset)
+            record = bytes(data[offset + _LENGTH.size:offset + _LENGTH.size + length])
+            yield record if encoding is None else record.decode(encoding, errors='replace')
+            offset += _LENGTH.size + length
+
+
+if __name__ == '__main__':
+    for _line in read(sys.argv[1]):
+        print(_line)
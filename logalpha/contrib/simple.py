@@ -12,23 +12,24 @@
 """Simple logging setup with colors."""
 
 # type annotations
-from typing import Type, Callable, IO
+from typing import Type, Callable, IO, List
 
 # standard libs
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # internal libs
-from ..color import ANSI_RESET
+from ..color import Color
 from ..level import CRITICAL, Level, WARNING
 from ..message import Message
-from ..handler import StreamHandler
+from ..handler import TemplateHandler
 from ..logger import Logger
 
 
 @dataclass
 class SimpleMessage(Message):
     """A message with a named `topic`."""
+    __slots__ = ('topic',)
     level: Level
     content: str
     topic: str
@@ -44,11 +45,11 @@ class SimpleLogger(Logger):
         """Initialize with `topic`."""
         super().__init__()
         self.topic = topic
-        self.callbacks = {'topic': (lambda: topic)}
+        self.fields = {'topic': topic}
 
 
 @dataclass
-class SimpleHandler(StreamHandler):
+class SimpleHandler(TemplateHandler):
     """
     Writes to <stderr> by default.
     Message format includes topic and level name.
@@ -58,18 +59,18 @@ class SimpleHandler(StreamHandler):
             The level for this handler.
         resource (:class:`Any`):
             Some resource to publish messages to.
+        template (str):
+            Message format (default: ``'{level:<8} [{topic}] {content}'``).
     """
 
     level: Level = WARNING
     resource: IO = sys.stderr
-
-    def format(self, message: SimpleMessage) -> str:
-        """Format the message."""
-        return f'{message.level.name:<8} [{message.topic}] {message.content}'
+    template: str = '{level:<8} [{topic}] {content}'
+    levels: List[Level] = field(default_factory=lambda: SimpleLogger.levels)
 
 
 @dataclass
-class ColorHandler(StreamHandler):
+class ColorHandler(SimpleHandler):
     """
     Writes to <stderr> by default.
     Message format colorizes level name.
@@ -79,15 +80,13 @@ class ColorHandler(StreamHandler):
             The level for this handler.
         resource (:class:`Any`):
             Some resource to publish messages to.
+        colors (List[:class:`~logalpha.color.Color`]):
+            Colors for level names (default: ``SimpleLogger.colors``).
     """
 
     level: Level = WARNING
     resource: IO = sys.stderr
-
-    def format(self, message: SimpleMessage) -> str:
-        """Format the message."""
-        color = SimpleLogger.colors[message.level.value].foreground
-        return f'{color}{message.level.name:<8}{ANSI_RESET} [{message.topic}] {message.content}'
+    colors: List[Color] = field(default_factory=lambda: SimpleLogger.colors)
 
 
 DEBUG = Logger.levels[0]  #:
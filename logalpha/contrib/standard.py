@@ -23,22 +23,41 @@ from socket import gethostname
 # internal libs
 from ..level import Level, WARNING
 from ..message import Message
-from ..handler import StreamHandler
+from ..timestamp import Timestamp, TimestampFormat, DEFAULT, WALL, to_datetime
+from ..handler import TemplateHandler
 from ..logger import Logger
 
 
 @dataclass
 class StandardMessage(Message):
-    """A message with standard attributes."""
+    """
+    A message with standard attributes.
+
+    The `timestamp` is whatever the logger's clock returns, either a
+    :class:`~datetime.datetime` or integer nanoseconds since the epoch.
+    Use :attr:`datetime` for the former in either case.
+    """
+    __slots__ = ('timestamp', 'topic', 'host', '_datetime')
     level: Level
     content: str
-    timestamp: datetime
+    timestamp: Timestamp
     topic: str
     host: str
 
+    @property
+    def datetime(self) -> datetime:
+        """The `timestamp` as a :class:`~datetime.datetime` (created on first access)."""
+        if type(self.timestamp) is not int:
+            return self.timestamp
+        try:
+            return self._datetime
+        except AttributeError:
+            self._datetime = to_datetime(self.timestamp)
+            return self._datetime
+
 
 @dataclass
-class StandardHandler(StreamHandler):
+class StandardHandler(TemplateHandler):
     """
     A standard message handler writes to <stderr> by default.
     Message format includes all attributes.
@@ -48,15 +67,16 @@ class StandardHandler(StreamHandler):
             The level for this handler.
         resource (:class:`Any`):
             Some resource to publish messages to.
+        template (str):
+            Message format (default: ``'{timestamp} {host} {level:<8} [{topic}] {content}'``).
+        timestamp_format (:class:`~logalpha.timestamp.TimestampFormat`):
+            Formats the timestamp (default: :data:`~logalpha.timestamp.DEFAULT`).
     """
 
     level: Level = WARNING
     resource: IO = sys.stderr
-
-    def format(self, message: StandardMessage) -> str:
-        """Format the message."""
-        ts = message.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-        return f'{ts} {message.host} {message.level.name:<8} [{message.topic}] {message.content}'
+    template: str = '{timestamp} {host} {level:<8} [{topic}] {content}'
+    timestamp_format: TimestampFormat = DEFAULT
 
 
 # global constant for hostname
@@ -64,18 +84,27 @@ HOST: str = gethostname()
 
 
 class StandardLogger(Logger):
-    """Logger with :class:`StandardMessage`."""
+    """
+    Logger with :class:`StandardMessage`.
+
+    The `clock` provides the message `timestamp`. Creating a :class:`~datetime.datetime`
+    for every message is relatively expensive; a clock returning integer nanoseconds
+    (:data:`~logalpha.timestamp.WALL_NS` or :data:`~logalpha.timestamp.MONOTONIC_NS`)
+    defers that until (and unless) a handler needs it.
+
+    Example:
+        >>> log = StandardLogger(__name__, clock=MONOTONIC_NS)
+    """
 
     Message: Type[Message] = StandardMessage
     topic: str
 
-    def __init__(self, topic: str) -> None:
-        """Initialize with `topic`."""
+    def __init__(self, topic: str, clock: Callable[[], Timestamp] = WALL) -> None:
+        """Initialize with `topic` and `clock`."""
         super().__init__()
         self.topic = topic
-        self.callbacks = {'timestamp': datetime.now,
-                          'host': (lambda: HOST),
-                          'topic': (lambda: topic)}
+        self.callbacks = {'timestamp': clock}
+        self.fields = {'host': HOST, 'topic': topic}
 
 
 DEBUG = Logger.levels[0]  #:
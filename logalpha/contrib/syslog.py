@@ -0,0 +1,207 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+
+"""Publish messages to a local syslog agent."""
+
+# type annotations
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# standard libs
+import os
+import sys
+import time
+import socket
+import threading
+from dataclasses import dataclass, field
+
+# internal libs
+from ..level import Level, LEVELS, WARNING, ERROR
+from ..message import Message
+from ..handler import Handler, _BUFFERED, _start_flusher  # noqa: protected (shared background flusher)
+
+
+# syslog severities (same names as the standard syslog module)
+LOG_EMERG: int = 0    #:
+LOG_ALERT: int = 1    #:
+LOG_CRIT: int = 2     #:
+LOG_ERR: int = 3      #:
+LOG_WARNING: int = 4  #:
+LOG_NOTICE: int = 5   #:
+LOG_INFO: int = 6     #:
+LOG_DEBUG: int = 7    #:
+
+# syslog facilities (a few of them)
+LOG_USER: int = 1     #:
+LOG_DAEMON: int = 3   #:
+LOG_LOCAL0: int = 16  #:
+
+#: Severity by level name, in upper case (any other name is :data:`LOG_NOTICE`).
+SEVERITIES: Dict[str, int] = {'TRACE': LOG_DEBUG, 'DEBUG': LOG_DEBUG, 'INFO': LOG_INFO, 'OK': LOG_INFO,
+                              'NOTICE': LOG_NOTICE, 'WARN': LOG_WARNING, 'WARNING': LOG_WARNING,
+                              'ERR': LOG_ERR, 'ERROR': LOG_ERR, 'CRIT': LOG_CRIT, 'CRITICAL': LOG_CRIT,
+                              'FATAL': LOG_CRIT, 'ALERT': LOG_ALERT, 'EMERG': LOG_EMERG, 'EMERGENCY': LOG_EMERG}
+
+# address of a unix socket (path) or UDP socket (host, port)
+Address = Union[str, Tuple[str, int]]
+
+
+@dataclass
+class SyslogHandler(Handler):
+    """
+    Publish messages to a syslog agent (e.g., ``/dev/log``) over a datagram socket.
+
+    One socket is opened and kept for the life of the handler (and opened again if the
+    agent restarts). The priority prefix (e.g., ``<14>app: ``) for each of the `levels` is
+    prepared in advance in a table by ``Level.value``; other levels (or levels with the same
+    value but another name) have theirs computed for each message. Level names are matched
+    to `severities` ignoring case.
+
+    If `batched`, several messages (separated by newlines) are sent in one datagram of
+    up to `max_size` bytes. A batch is sent when it is full, for any message at or above
+    `flush_level`, after `flush_interval` seconds, and at exit. Only use this with an
+    agent that splits datagrams on newlines.
+
+    Example:
+        >>> handler = SyslogHandler(ident='app', facility=LOG_LOCAL0)
+        >>> handler = SyslogHandler(resource=('localhost', 514), batched=True)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`~logalpha.level.WARNING`).
+        resource (str or tuple):
+            Path of a unix socket or (host, port) for UDP (default: ``'/dev/log'``).
+        ident (str):
+            Prefix for each message (default: name of the program).
+        facility (int):
+            Syslog facility (default: :data:`LOG_USER`).
+        levels (List[:class:`~logalpha.level.Level`]):
+            Levels with a prefix prepared in advance (default: :data:`~logalpha.level.LEVELS`).
+        severities (Dict[str, int]):
+            Severity by level name (default: :data:`SEVERITIES`).
+        batched (bool):
+            Send several messages per datagram (default: False).
+        max_size (int):
+            Largest datagram in bytes, longer messages are truncated (default: 2048).
+        flush_interval (float):
+            Send batches that are older than this many seconds (default: 1.0).
+        flush_level (:class:`~logalpha.level.Level`):
+            Send the batch immediately for messages at or above this level
+            (default: :data:`~logalpha.level.ERROR`).
+    """
+
+    level: Level = WARNING
+    resource: Address = '/dev/log'
+
+    ident: Optional[str] = None
+    facility: int = LOG_USER
+    levels: Optional[List[Level]] = None
+    severities: Optional[Dict[str, int]] = None
+
+    batched: bool = False
+    max_size: int = 2048
+    flush_interval: float = 1.0
+    flush_level: Level = ERROR
+
+    _socket: Optional[socket.socket] = field(default=None, init=False, repr=False, compare=False)
+    _prefixes: Dict[int, Tuple[str, bytes]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _buffer: List[bytes] = field(default_factory=list, init=False, repr=False, compare=False)
+    _buffer_size: int = field(default=0, init=False, repr=False, compare=False)
+    _batch_time: float = field(default=0.0, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Prepare the priority table."""
+        if self.ident is None:
+            self.ident = os.path.basename(sys.argv[0]) or 'python'
+        self._prepare()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prepare the priority table again when the configuration changes."""
+        super().__setattr__(name, value)
+        if name in ('ident', 'facility', 'levels', 'severities') and '_prefixes' in self.__dict__:
+            self._prepare()
+
+    def _prepare(self) -> None:
+        """Compute the priority prefix for all `levels`."""
+        levels = LEVELS if self.levels is None else self.levels
+        self._prefixes = {level.value: (level.name, self._prefix(level.name)) for level in levels}
+
+    def _prefix(self, name: str) -> bytes:
+        """The priority prefix for a level called `name`."""
+        severities = SEVERITIES if self.severities is None else self.severities
+        severity = severities.get(name, severities.get(name.upper(), LOG_NOTICE))
+        return f'<{self.facility * 8 + severity}>{self.ident}: '.encode()
+
+    def write(self, message: Message) -> None:
+        """Send `message` (or add it to the batch)."""
+        level = message.level
+        entry = self._prefixes.get(level.value)
+        prefix = entry[1] if entry is not None and entry[0] == level.name else self._prefix(level.name)
+        data = (prefix + self.format(message).encode())[:self.max_size]
+        with self._lock:
+            if not self.batched:
+                self._send(data)
+                return
+            if self._buffer and self._buffer_size + 1 + len(data) > self.max_size:
+                self._flush()
+            if not self._buffer:
+                self._batch_time = time.monotonic()
+                _BUFFERED[id(self)] = self
+                _start_flusher()
+            self._buffer.append(data)
+            self._buffer_size += len(data) + (len(self._buffer) > 1)
+            if message.level.value >= self.flush_level.value:
+                self._flush()
+
+    def format(self, message: Message) -> str:
+        """Returns :data:`message.content`."""
+        return str(message.content)
+
+    def flush(self) -> None:
+        """Send the current batch."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Send the current batch (caller must hold the lock)."""
+        if self._buffer:
+            data = b'\n'.join(self._buffer)
+            self._buffer.clear()
+            self._buffer_size = 0
+            self._send(data)
+
+    def _send(self, data: bytes) -> None:
+        """Send one datagram, connecting (again) if needed (caller must hold the lock)."""
+        try:
+            if self._socket is None:
+                self._connect()
+            self._socket.send(data)
+        except OSError:
+            self.close()  # e.g., the agent was restarted
+            self._connect()
+            self._socket.send(data)
+
+    def _connect(self) -> None:
+        """Open the socket."""
+        family = socket.AF_UNIX if isinstance(self.resource, str) else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            sock.connect(self.resource)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+
+    def close(self) -> None:
+        """Close the socket (opened again by the next message)."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
@@ -0,0 +1,485 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Sampling, rate-limiting, duplicate-collapsing, and matching filters."""
+
+# type annotations
+from __future__ import annotations
+from typing import Any, Callable, ClassVar, Dict, Hashable, List, Optional, Tuple
+
+# standard libs
+import time
+import fnmatch
+import random
+import threading
+import dataclasses
+from dataclasses import dataclass, field
+
+# internal libs
+from .level import Level, WARNING
+from .message import Message
+from .handler import Handler, _BUFFERED, _start_flusher  # noqa: protected (shared background flusher)
+
+
+@dataclass
+class Filter:
+    """
+    Decide whether to publish a message, before any handler formats it.
+
+    Calling the filter returns True to publish the message. Derived classes implement
+    :meth:`accept`. Suppressed messages are counted by `key` (a message attribute, e.g.,
+    'level' or 'topic'; all messages share one key if None). Once `report_interval`
+    seconds have passed since the first message was suppressed, :meth:`report` returns
+    a summary at `report_level` (a copy of the next message with new `level` and
+    `content`) and the count starts over. If no other message arrives in time, the
+    summary is published from a background thread instead (see :meth:`flush`).
+
+    Attributes:
+        key (str):
+            Name of the message attribute to count (and limit) separately (default: None).
+            Messages without this attribute are counted together.
+        levels (List[:class:`~logalpha.level.Level`]):
+            Only apply to messages with one of these levels (default: None, for all).
+        report_interval (float):
+            Seconds between reports of suppressed messages (default: 60.0).
+        report_level (:class:`~logalpha.level.Level`):
+            Level for reports (default: :data:`~logalpha.level.WARNING`).
+        max_keys (int):
+            Forget all state once there are this many distinct keys (default: 1024).
+    """
+
+    key: Optional[str] = None
+    levels: Optional[List[Level]] = None
+    report_interval: float = 60.0
+    report_level: Level = WARNING
+    max_keys: int = 1024
+
+    # counts by key since the last report, and when the first of them was suppressed
+    # (the same names as batches of buffered handlers, for the background flusher)
+    _buffer: Dict[Hashable, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _batch_time: float = field(default=0.0, init=False, repr=False, compare=False)
+    _latest: Optional[Tuple[Message, Callable[[Message], None]]] = field(default=None, init=False, repr=False,
+                                                                         compare=False)
+    _suppressed: int = field(default=0, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prepare the set of level values when `levels` is assigned."""
+        super().__setattr__(name, value)
+        if name == 'levels':
+            self._values = None if value is None else frozenset(level.value for level in value)
+
+    @property
+    def suppressed(self) -> int:
+        """Total number of messages suppressed by this filter."""
+        return self._suppressed
+
+    @property
+    def flush_interval(self) -> float:
+        """Same as `report_interval` (for the background flusher)."""
+        return self.report_interval
+
+    def __call__(self, message: Message) -> bool:
+        """True if `message` should be published (counted as suppressed otherwise)."""
+        if self._values is not None and message.level.value not in self._values:
+            return True
+        if self.key is None:
+            key = None
+        else:
+            key = getattr(message, self.key, None)  # messages without the attribute share one key
+            if isinstance(key, Level):
+                key = key.name
+        if self.accept(key, message):
+            return True
+        with self._lock:
+            if not self._buffer:
+                self._batch_time = time.monotonic()
+                _BUFFERED[id(self)] = self
+                _start_flusher()
+            self._buffer[key] = self._buffer.get(key, 0) + 1
+            self._suppressed += 1
+        return False
+
+    def accept(self, key: Hashable, message: Message) -> bool:
+        """True if `message` (with `key`) should be published."""
+        raise NotImplementedError()
+
+    def report(self, message: Message) -> Optional[Message]:
+        """
+        A summary of the messages suppressed since the last report (based on `message`),
+        or None if nothing was suppressed or the report is not yet due.
+
+        Example:
+            >>> rate_limit.report(message).content
+            'RateLimit suppressed 1530 messages (ERROR: 1500, WARNING: 30)'
+        """
+        if not self._buffer or time.monotonic() < self._batch_time + self.report_interval:
+            return None
+        return self._summary(message)
+
+    def flush(self) -> None:
+        """
+        Publish a summary of the messages suppressed so far (if any), based on the latest
+        of them and to the same place as the messages that passed (see :func:`apply_filters`).
+
+        This is called from a background thread once the report is due, and at exit.
+        """
+        latest = self._latest
+        if latest is not None:
+            message, publish = latest
+            report = self._summary(message)
+            if report is not None:
+                publish(report)
+
+    def _summary(self, message: Message) -> Optional[Message]:
+        """A summary of the messages suppressed since the last report (based on `message`)."""
+        with self._lock:
+            pending, self._buffer = self._buffer, {}
+            self._latest = None
+        if not pending:
+            return None  # reported by another thread
+        content = f'{self.__class__.__name__} suppressed {sum(pending.values())} messages'
+        if self.key is not None:
+            counts = sorted(pending.items(), key=lambda item: item[1], reverse=True)
+            content += ' (' + ', '.join(f'{key}: {count}' for key, count in counts[:10])
+            content += ', ...)' if len(counts) > 10 else ')'
+        return dataclasses.replace(message, level=self.report_level, content=content)
+
+    def _forget(self, state: Dict[Hashable, Any]) -> None:
+        """Clear `state` if it has reached `max_keys` (caller must hold the lock)."""
+        if len(state) >= self.max_keys:
+            state.clear()
+
+
+@dataclass
+class RateLimit(Filter):
+    """
+    Publish at most `rate` messages per second (per `key`) with bursts of up to `burst`
+    messages (a token bucket).
+
+    Example:
+        >>> log.filters = [RateLimit(rate=10, burst=100, key='topic')]
+
+    Attributes:
+        rate (float):
+            Messages per second, on average (default: 10.0).
+        burst (float):
+            Most messages at once, after a quiet period (default: 10.0).
+    """
+
+    rate: float = 10.0
+    burst: float = 10.0
+
+    _buckets: Dict[Hashable, List[float]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def accept(self, key: Hashable, message: Message) -> bool:
+        """Take a token from the bucket for `key` (if there is one)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._forget(self._buckets)
+                bucket = self._buckets[key] = [self.burst, now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True
+            bucket[0] = tokens
+            return False
+
+
+@dataclass
+class Sample(Filter):
+    """
+    Publish a random fraction of messages.
+
+    Example:
+        >>> log.filters = [Sample(probability=0.01, levels=[DEBUG])]
+
+    Attributes:
+        probability (float):
+            Chance of publishing each message (default: 0.1).
+    """
+
+    probability: float = 0.1
+
+    def accept(self, key: Hashable, message: Message) -> bool:
+        """True with the given `probability`."""
+        return random.random() < self.probability
+
+
+@dataclass
+class FirstThenEvery(Filter):
+    """
+    Publish the `first` messages (per `key`) and then only every `every`-th message.
+
+    Example:
+        >>> log.filters = [FirstThenEvery(first=10, every=1000, key='content')]
+
+    Attributes:
+        first (int):
+            Number of messages to publish before thinning out (default: 10).
+        every (int):
+            Publish one in this many messages after the `first` (default: 100).
+    """
+
+    first: int = 10
+    every: int = 100
+
+    _counts: Dict[Hashable, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def accept(self, key: Hashable, message: Message) -> bool:
+        """Count messages for `key`."""
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self._forget(self._counts)
+                count = 0
+            self._counts[key] = count + 1
+        return count < self.first or (count - self.first + 1) % self.every == 0
+
+
+def apply_filters(filters: List[Filter], message: Message, publish: Callable[[Message], None]) -> bool:
+    """
+    True if all `filters` accept `message` (stopping at the first that does not).
+    Reports that are due (see :meth:`Filter.report`) are passed to `publish`, now or
+    from a background thread if no other message arrives in time (see :meth:`Filter.flush`).
+    """
+    accepted = True
+    for item in filters:
+        if not item(message):
+            item._latest = message, publish  # noqa: protected (for the background flusher)
+            accepted = False
+            break
+    for item in filters:
+        if item._buffer:  # noqa: protected (skip the clock if nothing was suppressed)
+            report = item.report(message)
+            if report is not None:
+                publish(report)
+    return accepted
+
+
+@dataclass
+class FilterHandler(Handler):
+    """
+    Apply filters to messages before they reach `target` (i.e., before formatting).
+    Reports of suppressed messages are published to `target` as well.
+
+    Example:
+        >>> handler = FilterHandler(resource=[RateLimit(rate=100, key='content')], target=StandardHandler())
+        >>> StandardLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: the level of `target`).
+        resource (List[:class:`Filter`]):
+            The filters, applied in order.
+        target (:class:`~logalpha.handler.Handler`):
+            The handler to publish accepted messages to.
+    """
+
+    level: Level = None
+    resource: List[Filter] = None
+    target: Handler = None
+
+    def __post_init__(self) -> None:
+        """Validate arguments."""
+        if self.target is None:
+            raise ValueError('FilterHandler requires a target')
+        if self.resource is None:
+            self.resource = []
+        if self.level is None:
+            self.level = self.target.level
+
+    def write(self, message: Message) -> None:
+        """Publish `message` to `target` if all filters accept it."""
+        if apply_filters(self.resource, message, self._publish):
+            self.target.write(message)
+
+    def _publish(self, report: Message) -> None:
+        """Publish a report to `target` if its level is sufficient."""
+        if report.level >= self.target.level:
+            self.target.write(report)
+
+    def format(self, message: Message) -> Message:
+        """Messages are passed as-is, formatting is left to `target`."""
+        return message
+
+    def flush(self) -> None:
+        """Flush `target`."""
+        if hasattr(self.target, 'flush'):
+            self.target.flush()
+
+
+@dataclass
+class CollapseHandler(Handler):
+    """
+    Publish only the first of consecutive identical messages to `target`, followed by
+    a summary (e.g., "Last message repeated 48213 times") once a different message
+    arrives, every `flush_interval` seconds while the repetition lasts, and at exit.
+
+    Messages are identical if they have the same level, `topic` (if any), and content.
+    The comparison is against the previous message only, and costs a tuple comparison
+    (which stops at the first difference) on the normal path.
+
+    Example:
+        >>> handler = CollapseHandler(target=StandardHandler())
+        >>> StandardLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: the level of `target`).
+        resource (Any):
+            Unused (default: None).
+        target (:class:`~logalpha.handler.Handler`):
+            The handler to publish messages to.
+        flush_interval (float):
+            Seconds between summaries while a message keeps repeating (default: 30.0).
+    """
+
+    level: Level = None
+    resource: Any = None
+    target: Handler = None
+    flush_interval: float = 30.0
+
+    # identity (level value, topic, content) of the last message published to `target`
+    _last: Tuple[Any, ...] = field(default=None, init=False, repr=False, compare=False)
+    _buffer: List[Any] = field(default_factory=list, init=False, repr=False, compare=False)
+    _batch_time: float = field(default=0.0, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate arguments."""
+        if self.target is None:
+            raise ValueError('CollapseHandler requires a target')
+        if self.level is None:
+            self.level = self.target.level
+
+    def write(self, message: Message) -> None:
+        """Publish `message` to `target` unless it is the same as the last one."""
+        key = (message.level.value, getattr(message, 'topic', None), message.content)
+        with self._lock:
+            if key == self._last:
+                buffer = self._buffer  # latest repetition (for the summary) and count
+                if buffer:
+                    buffer[0] = message
+                    buffer[1] += 1
+                else:
+                    buffer[:] = message, 1
+                    self._batch_time = time.monotonic()
+                    _BUFFERED[id(self)] = self
+                    _start_flusher()
+                return
+            if self._buffer:
+                self._flush()
+            self.__dict__['_last'] = key  # skipping Handler.__setattr__
+        self.target.write(message)
+
+    def format(self, message: Message) -> Message:
+        """Messages are passed as-is, formatting is left to `target`."""
+        return message
+
+    def flush(self) -> None:
+        """Publish the summary of repetitions so far (if any) and flush `target`."""
+        with self._lock:
+            self._flush()
+        if hasattr(self.target, 'flush'):
+            self.target.flush()
+
+    def _flush(self) -> None:
+        """Publish the summary of repetitions so far (caller must hold the lock)."""
+        if self._buffer:
+            latest, count = self._buffer
+            self._buffer.clear()
+            self.target.write(dataclasses.replace(latest, content=f'Last message repeated {count} times'))
+
+
+@dataclass
+class MatchHandler(Handler):
+    """
+    Publish to `target` only messages up to `max_level` and with a `topic` matching
+    one of the patterns in `resource` (see :mod:`fnmatch`).
+
+    These conditions are part of :meth:`accepts`, so a logger evaluates them once per
+    level when it builds its dispatch table (see :meth:`~logalpha.handler.HandlerList.dispatch`)
+    and never calls this handler for messages it would discard. Topics are only known
+    in advance if they are a static field (e.g., :class:`~logalpha.contrib.standard.StandardLogger`);
+    otherwise they are matched for each message (results are cached by topic).
+
+    Example:
+        >>> handler = MatchHandler(resource=['app.db*'], max_level=INFO, target=StandardHandler(level=DEBUG))
+        >>> StandardLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: the level of `target`).
+        resource (List[str]):
+            Topic patterns (default: None, for any topic).
+        target (:class:`~logalpha.handler.Handler`):
+            The handler to publish messages to.
+        max_level (:class:`~logalpha.level.Level`):
+            Highest level to publish (default: None, for no limit).
+    """
+
+    level: Level = None
+    resource: Optional[List[str]] = None
+    target: Handler = None
+    max_level: Optional[Level] = None
+
+    dispatch_fields: ClassVar[Tuple[str, ...]] = ('level', 'resource', 'max_level')
+
+    _matches: Dict[Any, bool] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate arguments."""
+        if self.target is None:
+            raise ValueError('MatchHandler requires a target')
+        if self.level is None:
+            self.level = self.target.level
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Forget matched topics when the patterns change."""
+        if name == 'resource' and '_matches' in self.__dict__:
+            self._matches = {}
+        super().__setattr__(name, value)
+
+    def accepts(self, value: int, fields: Optional[Dict[str, Any]] = None) -> bool:
+        """True if `value` is in range and the topic (if a static field) matches."""
+        if value < self.level.value or (self.max_level is not None and value > self.max_level.value):
+            return False
+        if self.resource is None or fields is None or 'topic' not in fields:
+            return True
+        return self._match(fields['topic'])
+
+    def _match(self, topic: Any) -> bool:
+        """True if `topic` matches any of the patterns."""
+        matched = self._matches.get(topic)
+        if matched is None:
+            matched = isinstance(topic, str) and any(fnmatch.fnmatchcase(topic, pattern) for pattern in self.resource)
+            if len(self._matches) >= 1024:
+                self._matches.clear()
+            self._matches[topic] = matched
+        return matched
+
+    def write(self, message: Message) -> None:
+        """Publish `message` to `target` if it matches."""
+        if ((self.max_level is None or message.level.value <= self.max_level.value) and
+                (self.resource is None or self._match(getattr(message, 'topic', None)))):
+            self.target.write(message)
+
+    def format(self, message: Message) -> Message:
+        """Messages are passed as-is, formatting is left to `target`."""
+        return message
+
+    def flush(self) -> None:
+        """Flush `target`."""
+        if hasattr(self.target, 'flush'):
+            self.target.flush()
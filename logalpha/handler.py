@@ -12,16 +12,39 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Any, IO
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Callable, ClassVar
 
 # standard libs
 import sys
-from dataclasses import dataclass
+import time
+import atexit
+import asyncio
+import weakref
+import threading
+from collections.abc import MutableSequence
+import dataclasses
+from dataclasses import dataclass, field
 
 
 # internal libs
-from .level import Level, WARNING
+from .level import Level, LEVELS, WARNING, ERROR
+from .color import Color
 from .message import Message
+from .timestamp import TimestampFormat, DEFAULT
+from .template import Template, compile_template
+
+
+class _FormatKey:
+    """
+    Identifies the output of a handler's `format` by its class and `format_fields`.
+    The result is cached on the instance until one of those attributes is reassigned.
+    """
+
+    def __get__(self, instance: Handler, owner: type) -> Optional[Tuple[Any, ...]]:
+        fields = instance.format_fields
+        key = None if fields is None else (type(instance).format, *[getattr(instance, name) for name in fields])
+        instance.__dict__['_format_key'] = key
+        return key
 
 
 @dataclass
@@ -40,6 +63,47 @@ class Handler:
     level: Level
     resource: Any
 
+    # Names of the attributes (besides the class) that `format` depends on.
+    # If not None, handlers of the same class with equal values for these attributes
+    # share the formatted output for a given message (see `format_cached`).
+    # Sharing is opt-in: only handlers that declare their dependencies set this.
+    format_fields: ClassVar[Optional[Tuple[str, ...]]] = None
+    _format_key: ClassVar[_FormatKey] = _FormatKey()
+
+    # Names of the attributes that `accepts` depends on.
+    # Reassigning any of them rebuilds the dispatch tables of all handler lists.
+    dispatch_fields: ClassVar[Tuple[str, ...]] = ('level',)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Derived classes adding new attributes or overriding `format` or `__init__`
+        must declare their own `format_fields` to keep sharing output.
+        """
+        super().__init_subclass__(**kwargs)
+        if 'format_fields' not in cls.__dict__ and cls.format_fields is not None:
+            inherited = {name for base in cls.__mro__[1:] for name in base.__dict__.get('__annotations__', {})}
+            if set(cls.__dict__.get('__annotations__', {})) - inherited or {'format', '__init__'} & set(cls.__dict__):
+                cls.format_fields = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refresh all handler lists when the `level` (or another of `dispatch_fields`) is changed."""
+        super().__setattr__(name, value)
+        if name in self.dispatch_fields:
+            for handlers in list(_REGISTRY.values()):
+                handlers.refresh()
+        elif self.format_fields and name in self.format_fields:
+            self.__dict__.pop('_format_key', None)
+
+    def accepts(self, value: int, fields: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        True if this handler publishes messages with level `value` from a logger
+        with static `fields` (see :meth:`HandlerList.dispatch`).
+
+        This is evaluated once per level and logger, not for each message. Derived
+        classes may add conditions (declaring the attributes in `dispatch_fields`).
+        """
+        return value >= self.level.value
+
     def write(self, message: Message) -> None:
         """Publish `message` to `resource` after calling `format`."""
         raise NotImplementedError()
@@ -48,26 +112,487 @@ class Handler:
         """Format `message`."""
         raise NotImplementedError()
 
+    def format_cached(self, message: Message) -> Any:
+        """
+        Similar to :meth:`format` but shares the result with other handlers
+        formatting the same message in the same way (see `format_fields`).
+        """
+        key = self._format_key
+        if key is None:
+            return self.format(message)
+        return message.memo(key, self.format, message)
+
+
+@dataclass
+class LockStats:
+    """
+    Contention for a handler's lock (see :attr:`StreamHandler.lock_stats`).
+
+    Attributes:
+        acquired (int):
+            Number of times the lock was acquired.
+        contended (int):
+            Number of times a thread had to wait for the lock.
+        wait_time (float):
+            Total time in seconds threads spent waiting for the lock.
+        waiters (int):
+            Number of threads waiting for the lock right now.
+        max_waiters (int):
+            Most threads ever waiting for the lock at the same time.
+    """
+
+    acquired: int = 0
+    contended: int = 0
+    wait_time: float = 0.0
+    waiters: int = 0
+    max_waiters: int = 0
+
 
 @dataclass
 class StreamHandler(Handler):
     """
     Publish messages to a file-like resource.
 
+    Each line (including its newline) is published with a single `write`. If `locked`,
+    writes are also serialized by a lock on the handler, for resources that are not
+    safe to use from several threads at once. Contention for that lock is recorded in
+    :attr:`lock_stats`, which helps to decide whether a queue (see
+    :class:`~logalpha.contrib.queue.QueueHandler`) would be better.
+
+    In `buffered` mode formatted lines are collected and published with a single
+    `write` (and `flush`) per batch. A batch is published when it reaches `buffer_bytes`
+    characters or `buffer_lines` lines, when `flush_interval` seconds have passed since
+    the last flush, immediately for any message at or above `flush_level`, and at exit.
+
     Attributes:
         level (:class:`~logalpha.level.Level`):
             The level for this handler (default: :data:`WARNING`).
         resource (`IO`):
             File-like resource to write to (default: :data:`sys.stderr`).
+        locked (bool):
+            Serialize writes with a lock (default: False, always locked if `buffered`).
+        buffered (bool):
+            Collect lines and write them in batches (default: False).
+        buffer_bytes (int):
+            Flush once the batch reaches this size in characters (default: 65536).
+        buffer_lines (int):
+            Flush once the batch reaches this many lines (default: 1024).
+        flush_interval (float):
+            Flush batches that are older than this many seconds (default: 1.0).
+        flush_level (:class:`~logalpha.level.Level`):
+            Flush immediately for messages at or above this level (default: :data:`ERROR`).
     """
 
     level: Level = WARNING
     resource: IO = sys.stderr
 
+    locked: bool = False
+    buffered: bool = False
+    buffer_bytes: int = 65536
+    buffer_lines: int = 1024
+    flush_interval: float = 1.0
+    flush_level: Level = ERROR
+
+    _buffer: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _buffer_size: int = field(default=0, init=False, repr=False, compare=False)
+    _batch_time: float = field(default=0.0, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _stats: LockStats = field(default_factory=LockStats, init=False, repr=False, compare=False)
+    _stats_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def lock_stats(self) -> LockStats:
+        """Copy of the current contention statistics for this handler's lock."""
+        with self._stats_lock:
+            return dataclasses.replace(self._stats)
+
+    def _acquire(self) -> None:
+        """Acquire the lock, recording contention."""
+        stats = self._stats
+        if not self._lock.acquire(blocking=False):
+            with self._stats_lock:
+                stats.waiters += 1
+                stats.max_waiters = max(stats.max_waiters, stats.waiters)
+            start = time.perf_counter()
+            self._lock.acquire()
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                stats.waiters -= 1
+                stats.contended += 1
+                stats.wait_time += waited
+        stats.acquired += 1
+
     def write(self, message: Message) -> None:
         """Publish `message` to `resource` after calling `format`."""
-        print(self.format(message), file=self.resource, flush=True)
+        line = f'{self.format_cached(message)}\n'
+        if not self.buffered:
+            if not self.locked:
+                self._publish(line)
+                return
+            self._acquire()
+            try:
+                self._publish(line)
+            finally:
+                self._lock.release()
+            return
+        self._acquire()
+        try:
+            now = time.monotonic()
+            if not self._buffer:
+                self._batch_time = now
+                _BUFFERED[id(self)] = self
+                _start_flusher()
+            self._buffer.append(line)
+            self._buffer_size += len(line)
+            if (message.level.value >= self.flush_level.value or
+                    self._buffer_size >= self.buffer_bytes or
+                    len(self._buffer) >= self.buffer_lines or
+                    now - self._batch_time >= self.flush_interval):
+                self._flush()
+        finally:
+            self._lock.release()
+
+    def flush(self) -> None:
+        """Publish any buffered lines to `resource`."""
+        self._acquire()
+        try:
+            self._flush()
+        finally:
+            self._lock.release()
+
+    def _flush(self) -> None:
+        """Join and write the current batch (caller must hold the lock)."""
+        if self._buffer:
+            batch = ''.join(self._buffer)
+            self._buffer.clear()
+            self._buffer_size = 0
+            self._publish(batch)
+
+    def _publish(self, text: str) -> None:
+        """Write and flush complete lines of `text` to `resource` with a single `write`."""
+        self.resource.write(text)
+        self.resource.flush()
 
     def format(self, message: Message) -> str:
         """Returns :data:`message.content`."""
         return message.content
+
+
+@dataclass
+class TemplateHandler(StreamHandler):
+    """
+    Format messages with a declarative `template` compiled into a specialized function.
+
+    See :func:`~logalpha.template.compile_template` for the template syntax. Formatted
+    (and colorized) level names are prepared in advance for all `levels`.
+
+    Example:
+        >>> handler = TemplateHandler(template='{timestamp} {host} {level:<8} [{topic}] {content}')
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (`IO`):
+            File-like resource to write to (default: :data:`sys.stderr`).
+        template (str):
+            Template for the formatted message (default: ``'{content}'``).
+        levels (List[:class:`~logalpha.level.Level`]):
+            Levels formatted in advance for ``{level}``; others are formatted on demand (default: :data:`~logalpha.level.LEVELS`).
+        colors (List[:class:`~logalpha.color.Color`]):
+            Colorize level names by `Level.value` (default: None).
+        timestamp_format (:class:`~logalpha.timestamp.TimestampFormat`):
+            Formats the timestamp (default: :data:`~logalpha.timestamp.DEFAULT`).
+    """
+
+    level: Level = WARNING
+    resource: IO = sys.stderr
+
+    template: str = '{content}'
+    levels: Optional[List[Level]] = None
+    colors: Optional[List[Color]] = None
+    timestamp_format: TimestampFormat = DEFAULT
+
+    # compiled functions are shared by identical configurations
+    format_fields: ClassVar[Tuple[str, ...]] = ('compiled',)
+
+    @property
+    def compiled(self) -> Template:
+        """The compiled `template`."""
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = self.__dict__['_compiled'] = compile_template(
+                self.template, LEVELS if self.levels is None else self.levels, self.colors, self.timestamp_format)
+        return compiled
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Recompile when the configuration changes."""
+        super().__setattr__(name, value)
+        if name in ('template', 'levels', 'colors', 'timestamp_format'):
+            self.__dict__.pop('_compiled', None)
+            self.__dict__.pop('_format_key', None)
+
+    def format(self, message: Message) -> str:
+        """Format `message` according to `template`."""
+        return self.compiled(message)
+
+
+@dataclass
+class AsyncStreamHandler(StreamHandler):
+    """
+    Publish messages to an :class:`asyncio.StreamWriter`.
+
+    Use with :class:`~logalpha.logger.AsyncLogger`. Awaited level methods (e.g.,
+    ``await log.info(...)``) call :meth:`write_async`, which waits for the writer to
+    drain if its buffer is full (backpressure). Fire-and-forget methods (e.g.,
+    ``log.info_nowait(...)``) call :meth:`write`, which never blocks the event loop.
+
+    Example:
+        >>> handler = await AsyncStreamHandler.from_file(sys.stderr)
+        >>> AsyncLogger.handlers.append(handler)
+
+    Attributes:
+        level (:class:`~logalpha.level.Level`):
+            The level for this handler (default: :data:`WARNING`).
+        resource (:class:`asyncio.StreamWriter`):
+            Stream to write to.
+        encoding (str):
+            Encoding for formatted lines (default: 'utf-8').
+    """
+
+    level: Level = WARNING
+    resource: asyncio.StreamWriter = None
+    encoding: str = 'utf-8'
+
+    def write(self, message: Message) -> None:
+        """Append `message` to the writer's buffer after calling `format`."""
+        self.resource.write(f'{self.format_cached(message)}\n'.encode(self.encoding))
+
+    async def write_async(self, message: Message) -> None:
+        """Similar to :meth:`write` but waits for the writer to drain."""
+        self.resource.write(f'{self.format_cached(message)}\n'.encode(self.encoding))
+        await self.resource.drain()
+
+    def flush(self) -> None:
+        """Nothing to do, the transport writes as fast as the consumer allows."""
+
+    @classmethod
+    async def from_file(cls, file: IO = sys.stderr, **options) -> AsyncStreamHandler:
+        """
+        Construct a handler writing to the pipe or terminal behind `file`.
+
+        .. note::
+
+            This puts the file descriptor in non-blocking mode. Other (synchronous)
+            writers to the same descriptor may then fail with :class:`BlockingIOError`.
+        """
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, file)
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        return cls(resource=writer, **options)
+
+
+# buffered stream handlers with pending lines
+_BUFFERED: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_FLUSHER: threading.Thread = None
+_FLUSHER_LOCK: threading.Lock = threading.Lock()
+
+
+_FLUSHER_WAKE: threading.Event = threading.Event()
+
+
+def _flush_stale() -> None:
+    """Flush batches as they become older than their handler's `flush_interval`."""
+    while True:
+        now = time.monotonic()
+        deadline = None
+        for handler in list(_BUFFERED.values()):
+            if not handler._buffer:  # noqa: protected
+                continue
+            expires = handler._batch_time + handler.flush_interval  # noqa: protected
+            if expires <= now:
+                try:
+                    handler.flush()
+                except (OSError, ValueError):
+                    pass  # resource has gone away (e.g., closed file)
+            elif deadline is None or expires < deadline:
+                deadline = expires
+        _FLUSHER_WAKE.wait(None if deadline is None else deadline - now)
+        _FLUSHER_WAKE.clear()
+
+
+def _start_flusher() -> None:
+    """Start (or wake) the background flushing thread for a new batch."""
+    global _FLUSHER
+    if _FLUSHER is None:
+        with _FLUSHER_LOCK:
+            if _FLUSHER is None:
+                _FLUSHER = threading.Thread(target=_flush_stale, name='logalpha-flush', daemon=True)
+                _FLUSHER.start()
+    _FLUSHER_WAKE.set()
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Flush all buffered handlers at exit."""
+    for handler in list(_BUFFERED.values()):
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            pass  # resource has gone away (e.g., closed file)
+
+
+# live handler lists, refreshed whenever some handler changes its level
+_REGISTRY: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+# most entries in the dispatch table of a handler list
+_MAX_TABLE: int = 4096
+
+
+class HandlerList(MutableSequence):
+    """
+    A copy-on-write list of handlers that keeps track of the minimum level across its members.
+
+    The handlers are held in a tuple that is never modified; every change builds a new
+    tuple under a lock and swaps it in with a single assignment. Iterating (as the
+    :class:`~logalpha.logger.Logger` does for every message) takes no lock and sees a
+    consistent snapshot, even if other threads add or remove handlers concurrently.
+
+    Each change also recomputes :attr:`min_value`, as does any handler changing its
+    `level`. The :class:`~logalpha.logger.Logger` checks this value before doing
+    anything else so that suppressed messages cost almost nothing. Messages that pass
+    are published to the handlers from :meth:`dispatch`, a table by level value.
+
+    Example:
+        >>> handlers = HandlerList([StreamHandler(level=INFO), StreamHandler(level=ERROR)])
+        >>> handlers.min_value
+        1
+    """
+
+    #: Minimum `level.value` over all handlers (infinite if empty).
+    min_value: float = float('inf')
+
+    _handlers: Tuple[Handler, ...]
+    _table: Dict[Tuple[int, int], Tuple[Optional[Dict[str, Any]], Tuple[Handler, ...]]]
+    _lock: threading.Lock
+
+    def __init__(self, handlers: Iterable[Handler] = ()) -> None:
+        """Initialize with existing `handlers`."""
+        self._handlers = tuple(handlers)
+        self._table = {}
+        self._lock = threading.Lock()
+        _REGISTRY[id(self)] = self
+        self.refresh()
+
+    @property
+    def snapshot(self) -> Tuple[Handler, ...]:
+        """The current handlers (unaffected by later changes)."""
+        return self._handlers
+
+    def update(self, function: Callable[[List[Handler]], Any]) -> Any:
+        """
+        Apply `function` to a copy of the handlers as a list and swap in the result.
+        Changes from other threads are serialized. Returns the result of `function`.
+
+        Example:
+            >>> handlers.update(lambda members: members.sort(key=lambda handler: handler.level))
+        """
+        with self._lock:
+            members = list(self._handlers)
+            result = function(members)
+            self._handlers = tuple(members)
+            self._table = {}  # after the handlers (see _build)
+            self.min_value = min((handler.level.value for handler in members), default=float('inf'))
+            return result
+
+    def replace(self, handlers: Iterable[Handler]) -> None:
+        """Replace all handlers at once."""
+        handlers = tuple(handlers)
+        self.update(lambda members: members.__setitem__(slice(None), handlers))
+
+    def refresh(self) -> None:
+        """Recompute :attr:`min_value` and clear the dispatch table."""
+        self.update(lambda members: None)
+
+    def dispatch(self, value: int, fields: Optional[Dict[str, Any]] = None) -> Tuple[Handler, ...]:
+        """
+        The handlers that accept messages with level `value` from a logger with static
+        `fields` (see :meth:`Handler.accepts`), in order.
+
+        The result is computed once and kept in a table by `value` (and `fields`, by
+        identity) until the next change, so that publishing a message does not compare
+        levels (or evaluate any other condition) for each handler.
+
+        Example:
+            >>> handlers = HandlerList([StreamHandler(level=INFO), StreamHandler(level=ERROR)])
+            >>> handlers.dispatch(WARNING.value)
+            (StreamHandler(level=Level(name='INFO', value=1), ...),)
+        """
+        entry = self._table.get((value, id(fields)))
+        if entry is None:
+            entry = self._build(value, fields)
+        return entry[1]
+
+    def _build(self, value: int,
+               fields: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Tuple[Handler, ...]]:
+        """Compute and store an entry of the dispatch table."""
+        table = self._table  # before the handlers, so a concurrent change discards this entry
+        entry = fields, tuple(handler for handler in self._handlers if handler.accepts(value, fields))
+        if len(table) >= _MAX_TABLE:
+            table.clear()  # e.g., many short-lived loggers with their own fields
+        table[value, id(fields)] = entry  # holds on to `fields` so its id is not reused
+        return entry
+
+    def __iter__(self) -> Iterator[Handler]:
+        return iter(self._handlers)
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._handlers[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, HandlerList):
+            return self._handlers == other._handlers
+        if isinstance(other, (list, tuple)):
+            return self._handlers == tuple(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self._handlers)!r})'
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self.update(lambda members: members.__setitem__(index, value))
+
+    def __delitem__(self, index: Any) -> None:
+        self.update(lambda members: members.__delitem__(index))
+
+    def insert(self, index: int, handler: Handler) -> None:
+        self.update(lambda members: members.insert(index, handler))
+
+    def append(self, handler: Handler) -> None:
+        self.update(lambda members: members.append(handler))
+
+    def extend(self, handlers: Iterable[Handler]) -> None:
+        handlers = tuple(handlers)
+        self.update(lambda members: members.extend(handlers))
+
+    def remove(self, handler: Handler) -> None:
+        self.update(lambda members: members.remove(handler))
+
+    def pop(self, index: int = -1) -> Handler:
+        return self.update(lambda members: members.pop(index))
+
+    def clear(self) -> None:
+        self.update(lambda members: members.clear())
+
+    def reverse(self) -> None:
+        self.update(lambda members: members.reverse())
+
+    def __iadd__(self, handlers: Iterable[Handler]) -> HandlerList:
+        self.extend(handlers)
+        return self
+
+    def __imul__(self, count: int) -> HandlerList:
+        self.update(lambda members: members.__imul__(count))
+        return self
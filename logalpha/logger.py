@@ -13,28 +13,95 @@
 
 # type annotations
 from __future__ import annotations
-from typing import List, Dict, Callable, Any, Type
+from typing import List, Dict, Callable, Any, Type, Optional, Tuple, Sequence
 
 # standard libs
-import functools
+from types import FunctionType
 
 # internal libs
 from .level import Level, DEBUG, INFO, WARNING, ERROR, CRITICAL
 from .color import Color, BLUE, GREEN, YELLOW, RED, MAGENTA
-from .handler import Handler, StreamHandler
-from .message import Message
+from .handler import Handler, StreamHandler, AsyncStreamHandler, HandlerList
+from .message import Message, MessageFactory, compile_factory
+from .filter import Filter, apply_filters
 
 
 # dictionary of parameter-less functions
 CallbackMethod = Callable[[], Any]
 
 
+class _Factory:
+    """
+    Resolve the compiled message factory for a logger's `Message`, `callbacks`, and `fields`.
+    The result is cached on the instance until either is reassigned.
+    """
+
+    def __get__(self, instance: Logger, owner: type) -> MessageFactory:
+        factory = compile_factory(instance.Message, tuple(instance.callbacks), tuple(instance.fields))
+        instance.__dict__['_factory'] = factory
+        return factory
+
+
+def _level_method(level: Level, name: str, nowait: bool = False) -> Callable[..., Any]:
+    """
+    Generate a method that writes `content` at `level`.
+    Messages below the level of every handler return right away, before calling :meth:`~Logger.write`.
+    """
+    value = level.value
+    if nowait:
+        def method(self: AsyncLogger, content: Any, *args: Any, **kwargs: Any) -> None:
+            try:
+                if value < self.handlers.min_value:
+                    return
+            except AttributeError:
+                pass  # handlers were replaced by something other than a HandlerList
+            self.write_nowait(level, content, *args, **kwargs)
+    else:
+        def method(self: Logger, content: Any, *args: Any, **kwargs: Any) -> Any:
+            try:
+                if value < self.handlers.min_value:
+                    return self._skipped
+            except AttributeError:
+                pass  # handlers were replaced by something other than a HandlerList
+            return self.write(level, content, *args, **kwargs)
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = f'Publish `content` with level {level.name} (see :meth:`write`).'
+    method.level = level
+    return method
+
+
+def _is_level_method(value: Any) -> bool:
+    """True if `value` was generated by :func:`_level_method`."""
+    return isinstance(value, FunctionType) and hasattr(value, 'level')
+
+
+class _Undefined:
+    """Hide an inherited level method (e.g., the derived class has different `levels`)."""
+
+    def __get__(self, instance: Optional[Logger], owner: type) -> Any:
+        raise AttributeError('undefined level method')
+
+
+_UNDEFINED = _Undefined()
+
+
+class _Skipped:
+    """Awaitable that completes immediately (returned by asynchronous level methods for suppressed messages)."""
+
+    def __await__(self) -> Any:
+        return iter(())
+
+
+_SKIPPED = _Skipped()
+
+
 class Logger:
     """
     Base logging interface.
 
     By default the `levels` and `colors` are the conventional set.
-    Append any number of appropriate handlers.
+    Append any number of appropriate handlers (shared by derived classes
+    unless derived with ``scoped=True``).
 
     Example:
         >>> log = Logger()
@@ -48,42 +115,252 @@ class Logger:
     # default configuration
     levels: List[Level] = [DEBUG, INFO, WARNING, ERROR, CRITICAL]
     colors: List[Color] = [BLUE, GREEN, YELLOW, RED, MAGENTA]
-    handlers: List[Handler] = []
+    handlers: List[Handler] = HandlerList()
+
+    # reassign (don't modify in-place) to change the message fields
+    callbacks: Dict[str, CallbackMethod] = dict()  # evaluated for each message
+    fields: Dict[str, Any] = dict()  # constant values (e.g., topic)
 
-    callbacks: Dict[str, CallbackMethod] = dict()
+    # evaluated for each message (before any handler);
+    # assign a list to the class or to an instance to add filters (don't modify in-place)
+    filters: Sequence[Filter] = ()
 
     # redefine to construct with callbacks
     Message: Type[Message] = Message
 
-    def write(self, level: Level, content: Any) -> None:
+    # compiled for Message and callbacks on first use
+    _factory: MessageFactory = _Factory()
+
+    # returned by level methods for messages below the level of every handler
+    _skipped: Any = None
+
+    def __init_subclass__(cls, scoped: bool = False, **kwargs) -> None:
+        """
+        Instrument level methods and ensure `handlers` is a :class:`~logalpha.handler.HandlerList`.
+
+        By default, derived classes share `handlers` with their base class (e.g., appending to
+        ``StandardLogger.handlers`` is the same as appending to ``Logger.handlers``). If `scoped`,
+        the derived class (and those derived from it) get their own `handlers` instead.
+
+        Example:
+            >>> class ServiceLogger(Logger, scoped=True):
+            ...     pass
+            >>> ServiceLogger.handlers is Logger.handlers
+            False
+        """
+        super().__init_subclass__(**kwargs)
+        if scoped and 'handlers' not in cls.__dict__:
+            cls.handlers = HandlerList()
+        if 'handlers' in cls.__dict__ and not isinstance(cls.handlers, HandlerList):
+            cls.handlers = HandlerList(cls.handlers)
+        cls._instrument()
+
+    @classmethod
+    def _instrument(cls) -> None:
+        """
+        Define level methods (e.g., :meth:`info`) on the class, once, in place of
+        resolving them for every call. Methods for levels not in `levels` are hidden,
+        and nothing else defined on the class is replaced.
+        """
+        methods = {method.__name__: method for method in cls._level_methods()}
+        for name in dir(cls):
+            if name not in methods and _is_level_method(getattr(cls, name, None)):
+                setattr(cls, name, _UNDEFINED)
+        for name, method in methods.items():
+            existing = getattr(cls, name, None)
+            if existing is None or _is_level_method(existing):
+                setattr(cls, name, method)
+
+    @classmethod
+    def _level_methods(cls) -> List[Callable[..., Any]]:
+        """Generated methods for each of the `levels`."""
+        return [_level_method(level, level.name.lower()) for level in cls.levels]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Discard the message factory if `callbacks`, `fields`, or `Message` are reassigned."""
+        super().__setattr__(name, value)
+        if name == 'callbacks' or name == 'fields' or name == 'Message':
+            self.__dict__.pop('_factory', None)
+
+    def child(self, **fields: Any) -> Logger:
+        """
+        A logger that shares all configuration but with different values for some `fields`.
+
+        Nothing is rebuilt: the child shares the `handlers`, level methods, `callbacks`,
+        and compiled message factory with this logger. Only the static `fields` are
+        replaced (and any instance attributes of the same name). A name in `callbacks`
+        becomes a static field for the child instead.
+
+        .. note::
+
+            A child is a full instance (so it works anywhere a logger does). Creating
+            one costs about twice as much as allocating an object with a copy of the
+            instance dictionary, and about half as much as the
+            :class:`~logalpha.contrib.standard.StandardLogger` constructor: measured
+            at 1.3-2.3 us, against 0.7-1.0 us and 2.7-3.1 us respectively (CPython 3.8,
+            see ``benchmarks/bench_child.py``). That is above 1 us; a lighter view that
+            looks up shared state on the parent would make every message slower instead.
+
+        Example:
+            >>> log = StandardLogger('app')
+            >>> log.child(topic='app.tenant').info('foo')
+        """
+        parent = self.fields
+        child = object.__new__(self.__class__)
+        state = child.__dict__
+        state.update(self.__dict__)
+        merged = state['fields'] = {**parent, **fields}
+        if len(merged) == len(parent):
+            state['_factory'] = self._factory  # field names are unchanged
+        else:
+            state.pop('_factory', None)
+            callbacks = state['callbacks'] = dict(self.callbacks)
+            for name in fields:
+                if name not in parent:
+                    if name not in callbacks:
+                        raise TypeError(f'{self.__class__.__name__}.child() got unexpected field \'{name}\'')
+                    del callbacks[name]
+        for name in fields:
+            if name in state:
+                state[name] = fields[name]
+        return child
+
+    def write(self, level: Level, content: Any, *args: Any, **kwargs: Any) -> None:
         """
         Publish `message` to all `handlers` if its `level` is sufficient for that handler.
 
+        If `args` or `kwargs` are given, `content` is a template and the message
+        content is ``content.format(*args, **kwargs)``. Otherwise, if `content` is
+        callable, the message content is ``content()``.
+
+        Example:
+            >>> log.debug('found {} items in {path}', count, path=path)
+            >>> log.debug(lambda: expensive_summary(data))
+
         .. note::
 
             It's expected that the logger will be called with one of the dynamically
             instrumented level methods (e.g., :meth:`info`), and not call the
             :meth:`write` method directly.
+
+        .. note::
+
+            Nothing is evaluated (not the `callbacks` nor the content) if no handler
+            accepts `level` from this logger (e.g., it is below that of every handler,
+            or every handler matches other topics). The content is rendered at most
+            once, regardless of the number of handlers.
+
+        .. note::
+
+            Messages suppressed by any of the `filters` (see :mod:`logalpha.filter`)
+            never reach the handlers, so they are not formatted.
         """
-        message = self.Message(level=level, content=content, **self._evaluate_callbacks())  # noqa: args
-        for handler in self.handlers:
-            if message.level >= handler.level:
-                handler.write(message)
-
-    def _evaluate_callbacks(self) -> Dict[str, Any]:
-        """Evaluates all methods in `callbacks` dictionary."""
-        return dict(zip(self.callbacks.keys(), map(lambda method: method(), self.callbacks.values())))
-
-    @property
-    @functools.lru_cache(maxsize=None)
-    def _level_map(self) -> Dict[str, Level]:
-        """Map lower-case level names to level instances."""
-        return {level.name.lower(): level for level in self.levels}
-
-    @functools.lru_cache(maxsize=None)
-    def __getattr__(self, name: str) -> Any:
-        """Automatically forward calls to level `name`."""
+        handlers = self._dispatch(level)
+        if handlers:
+            message = self._create_message(level, content, args, kwargs)
+            if message is not None:
+                for handler in handlers:
+                    handler.write(message)
+
+    def _dispatch(self, level: Level) -> Sequence[Handler]:
+        """The handlers for messages at `level` from this logger (from the dispatch table of the `handlers`)."""
         try:
-            return functools.partial(self.write, self._level_map[name])
-        except KeyError as error:
-            raise AttributeError(f'\'{self.__class__.__name__}\' object has no attribute \'{name}\'') from error
+            if level.value < self.handlers.min_value:
+                return ()
+            return self.handlers.dispatch(level.value, self.fields)
+        except AttributeError:
+            # handlers were replaced by something other than a HandlerList
+            return [handler for handler in self.handlers if level >= handler.level]
+
+    def _create_message(self, level: Level, content: Any,
+                        args: Tuple[Any, ...] = (), kwargs: Dict[str, Any] = None) -> Optional[Message]:
+        """
+        Construct new message, or None if it is filtered.
+        Only called once :meth:`_dispatch` has found handlers for `level`.
+        """
+        if args or kwargs:
+            content = content.format(*args, **kwargs)
+        elif callable(content):
+            content = content()
+        message = self._factory(level, content, self.callbacks, self.fields)
+        if self.filters and not apply_filters(self.filters, message, self._publish):
+            return None
+        return message
+
+    def _publish(self, message: Message) -> None:
+        """Publish `message` to all `handlers` if its `level` is sufficient (e.g., filter reports)."""
+        for handler in self._dispatch(message.level):
+            handler.write(message)
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward calls to level `name` if not already instrumented (e.g., `levels` were changed)."""
+        for level in self.levels:
+            if level.name.lower() == name:
+                return _level_method(level, name).__get__(self)
+        raise AttributeError(f'\'{self.__class__.__name__}\' object has no attribute \'{name}\'')
+
+
+Logger._instrument()  # noqa: protected
+
+
+class AsyncLogger(Logger, scoped=True):
+    """
+    Logging interface for use within :mod:`asyncio` applications.
+
+    Level methods are coroutines; awaiting them waits for any
+    :class:`~logalpha.handler.AsyncStreamHandler` to drain (backpressure).
+    Each level also has a fire-and-forget variant with a `_nowait` suffix
+    that returns immediately without blocking the event loop.
+
+    Asynchronous handlers are bound to an event loop, so `handlers`
+    are not shared with :class:`Logger` (see `scoped`).
+
+    Example:
+        >>> log = AsyncLogger()
+        >>> AsyncLogger.handlers.append(await AsyncStreamHandler.from_file(sys.stderr))
+        >>> await log.warning('foo')
+        foo
+        >>> log.warning_nowait('bar')
+        bar
+    """
+
+    # level methods must return something to await
+    _skipped: Any = _SKIPPED
+
+    async def write(self, level: Level, content: Any, *args: Any, **kwargs: Any) -> None:
+        """
+        Publish `message` to all `handlers` if its `level` is sufficient for that handler.
+        Waits for asynchronous handlers to drain.
+        """
+        handlers = self._dispatch(level)
+        if handlers:
+            message = self._create_message(level, content, args, kwargs)
+            if message is not None:
+                for handler in handlers:
+                    if isinstance(handler, AsyncStreamHandler):
+                        await handler.write_async(message)
+                    else:
+                        handler.write(message)
+
+    def write_nowait(self, level: Level, content: Any, *args: Any, **kwargs: Any) -> None:
+        """Similar to :meth:`write` but returns immediately without waiting on any handler."""
+        handlers = self._dispatch(level)
+        if handlers:
+            message = self._create_message(level, content, args, kwargs)
+            if message is not None:
+                for handler in handlers:
+                    handler.write(message)
+
+    @classmethod
+    def _level_methods(cls) -> List[Callable[..., Any]]:
+        """Generated methods for each of the `levels` and their `_nowait` variants."""
+        return super()._level_methods() + [_level_method(level, f'{level.name.lower()}_nowait', nowait=True)
+                                           for level in cls.levels]
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward calls to level `name` (or `name_nowait`) if not already instrumented."""
+        if name.endswith('_nowait'):
+            for level in self.levels:
+                if f'{level.name.lower()}_nowait' == name:
+                    return _level_method(level, name, nowait=True).__get__(self)
+        return super().__getattr__(name)
@@ -12,9 +12,11 @@
 
 # type annotations
 from __future__ import annotations
-from typing import Any
+from typing import Any, Callable, Dict, Tuple, Optional, Hashable
 
 # standard libs
+import functools
+import dataclasses
 from dataclasses import dataclass
 
 # internal libs
@@ -25,8 +27,8 @@ from .level import Level, INFO
 class Message:
     """
     Associates a level with content. Derived classes should add new fields.
-    The :class:`~logalpha.logger.Logger` should define `callbacks` to populate
-    these new fields.
+    The :class:`~logalpha.logger.Logger` should define `callbacks` (evaluated for
+    each message) or `fields` (constant values) to populate these new fields.
 
     Example:
         >>> msg = Message(level=INFO, content='Hello, world!')
@@ -40,6 +42,74 @@ class Message:
         It is not intended that you directly instantiate a message. Messages
         are automatically constructed by the :class:`~logalpha.logger.Logger`
         when calling one of the instrumented level methods.
+
+    .. note::
+
+        Messages define `__slots__` (no instance `__dict__`). Derived classes
+        may do the same for their new fields to keep messages compact, as long
+        as those fields do not have default values.
     """
+    __slots__ = ('level', 'content', '_memo')
     level: Level
     content: Any
+
+    def memo(self, key: Hashable, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Returns ``function(*args)``, computed only once for this message and `key`.
+        Handlers use this to share formatting work for the same message.
+
+        Example:
+            >>> message.memo(timestamp_format, timestamp_format, message.timestamp)
+            '2020-10-12 20:48:10.555'
+        """
+        memo = getattr(self, '_memo', None)
+        if memo is None:
+            memo = self._memo = {}
+        value = memo.get(key, _MISSING)
+        if value is _MISSING:
+            value = memo[key] = function(*args)
+        return value
+
+
+# distinguishes missing values from None
+_MISSING = object()
+
+
+# constructs a message from `level`, `content`, `callbacks`, and (static) `fields`
+MessageFactory = Callable[[Level, Any, Dict[str, Callable[[], Any]], Optional[Dict[str, Any]]], Message]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_factory(cls: type, names: Tuple[str, ...], static: Tuple[str, ...] = ()) -> MessageFactory:
+    """
+    Generate a function that constructs a `cls` instance from `level`, `content`,
+    the values returned by a `callbacks` dictionary with keys `names`, and the
+    values of a `fields` dictionary with keys `static` (which are not called).
+
+    The arguments are passed positionally in the order the fields are declared
+    on `cls` (a :class:`~dataclasses.dataclass`) without building an intermediate
+    dictionary. If a name is in both, the callback is used. Generated functions
+    are cached by `cls`, `names`, and `static`.
+
+    Example:
+        >>> factory = compile_factory(StandardMessage, ('timestamp',), ('host', 'topic'))
+        >>> factory(INFO, 'Hello, world!', {'timestamp': WALL}, {'host': HOST, 'topic': 'app'})
+        StandardMessage(level=Level(name='INFO', value=1), content='Hello, world!', ...)
+    """
+    given = {'level': 'level', 'content': 'content',
+             **{name: f'fields[{name!r}]' for name in static},
+             **{name: f'callbacks[{name!r}]()' for name in names}}
+    positional, keywords = [], []
+    if dataclasses.is_dataclass(cls):
+        for field in dataclasses.fields(cls):
+            if not field.init:
+                continue
+            if field.name not in given:
+                break
+            positional.append(given.pop(field.name))
+    keywords.extend(f'{name}={value}' for name, value in given.items())
+    source = (f'def factory(level, content, callbacks, fields=None):\n'
+              f'    return cls({", ".join(positional + keywords)})\n')
+    namespace = {'cls': cls}
+    exec(source, namespace)  # noqa: exec (generated from field names only)
+    return namespace['factory']
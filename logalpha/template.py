@@ -0,0 +1,104 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Compiled message templates."""
+
+# type annotations
+from __future__ import annotations
+from typing import List, Optional, Tuple, Callable, Dict, Any
+
+# standard libs
+import functools
+from string import Formatter
+
+# internal libs
+from .level import Level
+from .color import Color, ANSI_RESET
+from .message import Message
+from .timestamp import TimestampFormat, DEFAULT
+
+
+# formats a message as a string
+Template = Callable[[Message], str]
+
+
+def compile_template(template: str, levels: List[Level], colors: Optional[List[Color]] = None,
+                     timestamp_format: TimestampFormat = DEFAULT) -> Template:
+    """
+    Generate a function that formats a message according to `template`.
+
+    Fields in the template name message attributes (e.g., ``{topic}`` or ``{level.name}``)
+    and may include a format specification and conversion as with :meth:`str.format`.
+    Two fields are special: ``{level}`` is the level name, looked up in a table indexed
+    by ``Level.value`` that is prepared for all `levels` in advance (padded according to
+    its format specification, and wrapped in the ANSI codes for the level's color if
+    `colors` are given); levels that are not in the table are formatted on demand.
+    ``{timestamp}`` is formatted by `timestamp_format`.
+
+    Generated functions are cached by their arguments.
+
+    Example:
+        >>> template = compile_template('{level:<8} [{topic}] {content}', LEVELS, COLORS)
+        >>> template(message)
+        '\\x1b[32mINFO    \\x1b[0m [topic] Hello, world!'
+    """
+    names = [None] * (1 + max((level.value for level in levels), default=-1))
+    for level in levels:
+        names[level.value] = level.name
+    return _compile(template, tuple(names),
+                    None if colors is None else tuple(color.foreground for color in colors),
+                    timestamp_format)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(template: str, names: Tuple[Optional[str], ...], colors: Optional[Tuple[str, ...]],
+             timestamp_format: TimestampFormat) -> Template:
+    """Generate the function for :func:`compile_template`."""
+    namespace: Dict[str, Any] = {'timestamp_format': timestamp_format, 'names': names, 'colors': colors,
+                                 '_level_prefix': _level_prefix}
+    pieces = []
+    lines = []
+    for literal, name, spec, conversion in Formatter().parse(template):
+        pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+        if name is None:
+            continue
+        if not name or not all(part.isidentifier() for part in name.split('.')):
+            raise ValueError(f'Unsupported field \'{name}\' in template {template!r}')
+        if '{' in spec:
+            raise ValueError(f'Nested fields are not supported in template {template!r}')
+        if name == 'level':
+            table = f'level_{len(namespace)}'
+            namespace[table] = [_level_prefix(level_name, spec, colors, value)
+                                for value, level_name in enumerate(names)]
+            namespace[f'{table}_spec'] = spec
+            lines.append(f'{table}_text = {table}[value] if known else '
+                         f'_level_prefix(level.name, {table}_spec, colors, value)')
+            pieces.append(f'{{{table}_text}}')
+            continue
+        expression = 'timestamp_format(message.timestamp)' if name == 'timestamp' else f'message.{name}'
+        pieces.append('{' + expression + (f'!{conversion}' if conversion else '') + (f':{spec}' if spec else '') + '}')
+    if lines:
+        # levels missing from the tables (or named differently) are formatted on demand
+        lines[:0] = ['level = message.level', 'value = level.value',
+                     f'known = 0 <= value < {len(names)} and names[value] == level.name']
+    source = ''.join(f'    {line}\n' for line in lines)
+    source = f'def template(message):\n{source}    return f{"".join(pieces)!r}\n'
+    exec(source, namespace)  # noqa: exec (generated from validated field names only)
+    return namespace['template']
+
+
+def _level_prefix(name: Optional[str], spec: str, colors: Optional[Tuple[str, ...]], value: int) -> str:
+    """Formatted (and colorized) level name."""
+    if name is None:
+        return ''
+    text = format(name, spec)
+    if colors is None or not 0 <= value < len(colors):
+        return text
+    return f'{colors[value]}{text}{ANSI_RESET}'
@@ -0,0 +1,163 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Clock sources and timestamp formatting."""
+
+# type annotations
+from __future__ import annotations
+from typing import List, Union
+
+# standard libs
+import time
+from datetime import datetime
+
+
+# either a datetime or integer nanoseconds since the epoch
+Timestamp = Union[datetime, int]
+
+# fractional parts for millisecond precision
+_MILLIS: List[str] = [f'{ms:03d}' for ms in range(1000)]
+
+
+def to_datetime(ns: int) -> datetime:
+    """Convert nanoseconds since the epoch to a (naive, local) datetime."""
+    return datetime.fromtimestamp(ns // 1_000_000_000).replace(microsecond=ns // 1000 % 1_000_000)
+
+
+class MonotonicClock:
+    """
+    Nanoseconds since the epoch that never go backwards.
+
+    The wall clock is read once; after that time advances with :func:`time.monotonic_ns`.
+    Values are consistently ordered across threads, even if the system clock is adjusted.
+
+    Example:
+        >>> clock = MonotonicClock()
+        >>> clock() <= clock()
+        True
+    """
+
+    __slots__ = ('offset',)
+
+    def __init__(self) -> None:
+        """Anchor to the current wall clock."""
+        self.offset = time.time_ns() - time.monotonic_ns()
+
+    def __call__(self) -> int:
+        """Current time in nanoseconds."""
+        return self.offset + time.monotonic_ns()
+
+
+# clock sources (parameter-less callables returning a timestamp)
+WALL = datetime.now       #: Current (naive, local) :class:`~datetime.datetime` (default).
+WALL_NS = time.time_ns    #: Current wall-clock time in integer nanoseconds since the epoch.
+MONOTONIC_NS = MonotonicClock()  #: Similar to :data:`WALL_NS` but never goes backwards.
+
+
+class TimestampFormat:
+    """
+    Format timestamps with :meth:`~datetime.datetime.strftime` at most once per second.
+
+    The formatted date and time (up to the seconds) is cached for the current second;
+    only the fractional part is appended for each call. Optionally includes the UTC
+    offset (e.g., ``+02:00``) as with ISO-8601. Naive timestamps are taken as local time.
+
+    Timestamps may also be integer nanoseconds since the epoch (e.g., from :data:`WALL_NS`),
+    in which case no :class:`~datetime.datetime` is created except once per second.
+
+    Example:
+        >>> fmt = TimestampFormat('%Y-%m-%d %H:%M:%S', precision=3)
+        >>> fmt(datetime(2020, 10, 12, 20, 48, 10, 555000))
+        '2020-10-12 20:48:10.555'
+
+    Attributes:
+        fmt (str):
+            Format code for :meth:`~datetime.datetime.strftime` (without fractional seconds).
+        precision (int):
+            Number of digits for fractional seconds (0, 3, or 6).
+        separator (str):
+            Placed before the fractional seconds (default: '.').
+        utcoffset (bool):
+            Append the UTC offset as ``+HH:MM`` (default: False).
+    """
+
+    fmt: str
+    precision: int
+    separator: str
+    utcoffset: bool
+
+    def __init__(self, fmt: str = '%Y-%m-%d %H:%M:%S', precision: int = 3,
+                 separator: str = '.', utcoffset: bool = False) -> None:
+        """Initialize and validate `precision`."""
+        if precision not in (0, 3, 6):
+            raise ValueError(f'Unsupported precision {precision} (expected 0, 3, or 6)')
+        self.fmt = fmt
+        self.precision = precision
+        self.separator = separator
+        self.utcoffset = utcoffset
+        self._cache = (None, '', '')
+
+    def __call__(self, timestamp: Timestamp) -> str:
+        """Format `timestamp`."""
+        cache = self._cache
+        if type(timestamp) is int:
+            key, microsecond = divmod(timestamp // 1000, 1_000_000)
+            if cache[0] != key:
+                local = to_datetime(timestamp)
+                cache = self._cache = (key, self.prefix(local), self.suffix(local))
+        else:
+            microsecond = timestamp.microsecond
+            key = (timestamp.second, timestamp.minute, timestamp.hour,
+                   timestamp.day, timestamp.month, timestamp.year, timestamp.tzinfo)
+            if cache[0] != key:
+                cache = self._cache = (key, self.prefix(timestamp), self.suffix(timestamp))
+        if self.precision == 3:
+            return f'{cache[1]}{_MILLIS[microsecond // 1000]}{cache[2]}'
+        if self.precision == 6:
+            return f'{cache[1]}{microsecond:06d}{cache[2]}'
+        return f'{cache[1]}{cache[2]}'
+
+    def prefix(self, timestamp: datetime) -> str:
+        """Everything up to the fractional seconds (computed once per second)."""
+        prefix = timestamp.strftime(self.fmt)
+        return prefix + self.separator if self.precision else prefix
+
+    def suffix(self, timestamp: datetime) -> str:
+        """Everything after the fractional seconds (computed once per second)."""
+        if not self.utcoffset:
+            return ''
+        offset = (timestamp if timestamp.tzinfo else timestamp.astimezone()).strftime('%z')
+        return f'{offset[:3]}:{offset[3:]}' if offset else ''
+
+
+class EpochFormat(TimestampFormat):
+    """
+    Format timestamps as seconds (or milliseconds) since the Unix epoch.
+
+    Example:
+        >>> EpochFormat()(datetime(2020, 10, 12, 20, 48, 10, 555000, tzinfo=timezone.utc))
+        '1602535690.555'
+        >>> EpochFormat(millis=True)(datetime(2020, 10, 12, 20, 48, 10, 555000, tzinfo=timezone.utc))
+        '1602535690555'
+    """
+
+    def __init__(self, millis: bool = False) -> None:
+        """Seconds with millisecond precision or integer milliseconds."""
+        super().__init__(fmt='', precision=3, separator='' if millis else '.')
+
+    def prefix(self, timestamp: datetime) -> str:
+        """Whole seconds since the epoch."""
+        return f'{int(timestamp.replace(microsecond=0).timestamp())}{self.separator}'
+
+
+DEFAULT  = TimestampFormat('%Y-%m-%d %H:%M:%S')                  #: e.g., ``2020-10-12 20:48:10.555``
+ISO8601  = TimestampFormat('%Y-%m-%dT%H:%M:%S', utcoffset=True)  #: e.g., ``2020-10-12T20:48:10.555-04:00``
+EPOCH    = EpochFormat()                                         #: e.g., ``1602535690.555``
+EPOCH_MS = EpochFormat(millis=True)                              #: e.g., ``1602535690555``
@@ -32,6 +32,9 @@ with open('README.rst', mode='r') as readme:
 # no real dependencies
 DEPS = []
 
+# optional dependencies for faster backends
+EXTRAS = {'json': ['orjson'], }
+
 
 # add dependencies for readthedocs.io
 if os.environ.get('READTHEDOCS') == 'True':
@@ -57,5 +60,6 @@ setup(
                         'Programming Language :: Python :: 3.9',
                         'License :: OSI Approved :: Apache Software License', ],
     install_requires = DEPS,
+    extras_require   = EXTRAS,
     entry_points     = {'console_scripts': []},
 )
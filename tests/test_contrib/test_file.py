@@ -0,0 +1,100 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for FileHandler and rotation."""
+
+
+# standard libs
+import gzip
+import time
+
+# internal libs
+from logalpha.level import DEBUG, INFO, ERROR
+from logalpha.message import Message
+from logalpha.contrib.file import FileHandler, RotatingFileHandler, TimedRotatingFileHandler, _JOBS
+
+# external libs
+import pytest
+
+
+def test_file_handler(tmp_path) -> None:
+    """Check lines are appended to the file."""
+    path = tmp_path / 'test.log'
+    path.write_text('existing\n')
+    handler = FileHandler(level=DEBUG, path=str(path), template='{level.name}: {content}')
+    handler.write(Message(level=INFO, content='message'))
+    assert path.read_text() == 'existing\n'  # in the write buffer
+    handler.flush()
+    assert path.read_text() == 'existing\nINFO: message\n'
+    handler.write(Message(level=INFO, content='a'))
+    handler.write(Message(level=ERROR, content='b'))
+    assert path.read_text() == 'existing\nINFO: message\nINFO: a\nERROR: b\n'  # flush_level
+    handler.write(Message(level=INFO, content='c'))
+    handler.close()
+    assert path.read_text().endswith('ERROR: b\nINFO: c\n')
+
+    handler = FileHandler(level=DEBUG, path=str(path), template='{content}', buffered=True, buffer_lines=2)
+    for content in 'def':
+        handler.write(Message(level=INFO, content=content))
+    assert path.read_text().endswith('c\nd\ne\n')  # at the end of each batch
+    handler.close()
+
+    with pytest.raises(ValueError):
+        FileHandler()
+
+
+def test_rotating(tmp_path) -> None:
+    """Check files are rotated by size, compressed, and pruned."""
+    path = tmp_path / 'test.log'
+    handler = RotatingFileHandler(level=DEBUG, path=str(path), max_bytes=100, backup_count=3)
+    lines = [f'message {i:02d}\n' for i in range(50)]  # 11 bytes each, 9 per file
+    for line in lines:
+        handler.write(Message(level=INFO, content=line.strip()))
+    handler.flush()
+    _JOBS.join()
+
+    rotated = sorted(tmp_path.glob('test.log.*'))
+    assert len(rotated) == 3 and all(name.suffix == '.gz' for name in rotated)
+    contents = [gzip.decompress(name.read_bytes()).decode() for name in rotated]
+    assert ''.join(contents) + path.read_text() == ''.join(lines[18:])
+    assert all(len(content) == 99 for content in contents)
+
+
+def test_timed_rotating(tmp_path) -> None:
+    """Check files are rotated at multiples of the interval."""
+    path = tmp_path / 'test.log'
+    handler = TimedRotatingFileHandler(level=DEBUG, path=str(path), interval=60, compress=False)
+    assert time.time() < handler._rollover_at <= time.time() + 60  # noqa: protected
+    handler.write(Message(level=INFO, content='a'))
+    handler._rollover_at = time.time()  # noqa: protected
+    handler.write(Message(level=INFO, content='b'))
+    handler.flush()
+    _JOBS.join()
+
+    rotated, = tmp_path.glob('test.log.*')
+    assert rotated.read_text() == 'a\n' and path.read_text() == 'b\n'
+    assert handler._rollover_at > time.time()  # noqa: protected
+
+
+def test_prune_only_rotated(tmp_path) -> None:
+    """Check pruning leaves other files that share the prefix of the path alone."""
+    path = tmp_path / 'app'
+    bystanders = ['app.cfg', 'app.log', 'app.20201012-204810-555000.bak', 'other.20201012-204810-555000']
+    for name in bystanders:
+        (tmp_path / name).write_text('keep')
+    handler = RotatingFileHandler(level=DEBUG, path=str(path), max_bytes=10, backup_count=1, compress=False)
+    for i in range(3):
+        handler.write(Message(level=INFO, content=f'message {i}'))
+        _JOBS.join()
+    handler.close()
+
+    rotated, = tmp_path.glob('app.2*-*-*[0-9]')
+    assert rotated.read_text() == 'message 1\n' and path.read_text() == 'message 2\n'
+    assert all((tmp_path / name).read_text() == 'keep' for name in bystanders)
@@ -0,0 +1,68 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for JSONHandler."""
+
+
+# standard libs
+import json
+from io import StringIO
+from datetime import datetime
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.level import Level, INFO
+from logalpha.message import Message
+from logalpha.timestamp import EPOCH_MS
+from logalpha.contrib.standard import StandardLogger, StandardMessage, HOST
+from logalpha.contrib.json import JSONHandler, compile_encoder
+
+# external libs
+from hypothesis import given, strategies as st
+
+
+@dataclass
+class CustomMessage(Message):
+    """A message with custom fields."""
+    level: Level
+    content: str
+    count: int
+    tags: list
+
+
+@given(st.text(), st.integers(min_value=-2**53, max_value=2**53), st.lists(st.text()))
+def test_custom_fields(content, count, tags) -> None:
+    """Check all fields are serialized."""
+    handler = JSONHandler(level=INFO, resource=StringIO())
+    handler.write(CustomMessage(level=INFO, content=content, count=count, tags=tags))
+    line = handler.resource.getvalue()
+    assert line.endswith('\n') and line.count('\n') == 1
+    assert json.loads(line) == {'level': 'INFO', 'content': content, 'count': count, 'tags': tags}
+
+
+def test_standard_message() -> None:
+    """Check timestamps are formatted and the encoder is cached."""
+
+    class JSONLogger(StandardLogger, scoped=True):
+        """Don't share handlers with other tests."""
+
+    handler = JSONHandler(level=INFO, resource=StringIO(), timestamp_format=EPOCH_MS)
+    JSONLogger.handlers.append(handler)
+    JSONLogger('topic', clock=lambda: datetime(2020, 10, 12, 20, 48, 10, 555000)).info('message')
+    seconds = int(datetime(2020, 10, 12, 20, 48, 10).timestamp())
+    assert json.loads(handler.resource.getvalue()) == {'level': 'INFO', 'content': 'message',
+                                                       'timestamp': f'{seconds}555', 'topic': 'topic', 'host': HOST}
+    assert compile_encoder(StandardMessage, EPOCH_MS) is compile_encoder(StandardMessage, EPOCH_MS)
+
+    handler.timestamp_format = None
+    message = StandardMessage(level=INFO, content=object, timestamp=1_602_535_690_555_000_000, topic='a', host='b')
+    assert json.loads(handler.format(message)) == {'level': 'INFO', 'content': str(object),
+                                                   'timestamp': 1_602_535_690_555_000_000,
+                                                   'topic': 'a', 'host': 'b'}
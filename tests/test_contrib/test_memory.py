@@ -0,0 +1,73 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for MemoryHandler."""
+
+
+# standard libs
+from io import StringIO
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.level import LEVELS, DEBUG, ERROR
+from logalpha.message import Message
+from logalpha.handler import StreamHandler
+from logalpha.contrib.ok import OkayLogger, OK, ERR
+from logalpha.contrib.memory import MemoryHandler
+
+# external libs
+from hypothesis import given, strategies as st
+import pytest
+
+
+@dataclass
+class InMemoryHandler(StreamHandler):
+    """Messages written to in-memory `io.StringIO`."""
+
+    resource: StringIO = None
+
+    def format(self, message: Message) -> str:
+        return f'{message.level.name}: {message.content}'
+
+
+@given(st.lists(st.integers(min_value=0, max_value=4)), st.integers(min_value=1, max_value=5))
+def test_memory_handler(levels, capacity) -> None:
+    """Check the most recent messages are published for each message at the trigger level."""
+    target = InMemoryHandler(level=ERROR, resource=StringIO())
+    handler = MemoryHandler(target=target, capacity=capacity)
+    expected, retained = [], []
+    for i, value in enumerate(levels):
+        message = Message(level=LEVELS[value], content=str(i))
+        handler.write(message)
+        retained = (retained + [f'{message.level.name}: {i}'])[-capacity:]
+        if value >= ERROR.value:
+            expected.extend(retained)
+            retained = []
+    assert target.resource.getvalue().splitlines() == expected
+    assert len(handler.resource) == len(retained)
+
+
+def test_okay_logger() -> None:
+    """Check custom levels."""
+
+    class RecordingLogger(OkayLogger, scoped=True):
+        """Don't share handlers with other tests."""
+
+    target = InMemoryHandler(level=ERR, resource=StringIO())
+    RecordingLogger.handlers.append(MemoryHandler(level=OK, target=target, trigger_level=ERR))
+    log = RecordingLogger()
+    log.ok('a')
+    log.ok('b')
+    assert target.resource.getvalue() == ''
+    log.err('c')
+    assert target.resource.getvalue() == 'Ok: a\nOk: b\nErr: c\n'
+
+    with pytest.raises(ValueError):
+        MemoryHandler(level=DEBUG)
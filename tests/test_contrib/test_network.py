@@ -0,0 +1,184 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for NetworkHandler against a local collector."""
+
+
+# standard libs
+import time
+import socket
+import struct
+import threading
+import socketserver
+
+# internal libs
+from logalpha.level import DEBUG, INFO
+from logalpha.message import Message
+from logalpha.contrib.network import NetworkHandler
+
+# external libs
+import pytest
+
+
+class Collector(socketserver.ThreadingTCPServer):
+    """Collect frames from all connections."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, framing: str = 'line', stalled: bool = False) -> None:
+        self.frames, self.connections = [], 0
+        self.framing, self.stalled = framing, stalled
+        self.lock = threading.Lock()
+        super().__init__(address, Reader)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def wait(self, count: int, timeout: float = 10) -> list:
+        """Wait for at least `count` frames."""
+        deadline = time.monotonic() + timeout
+        while len(self.frames) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.frames
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class Reader(socketserver.StreamRequestHandler):
+    """Read frames from one connection."""
+
+    def handle(self) -> None:
+        with self.server.lock:
+            self.server.connections += 1
+        if self.server.stalled:
+            time.sleep(60)
+        while True:
+            if self.server.framing == 'line':
+                frame = self.rfile.readline()[:-1]
+                if not frame:
+                    return
+            else:
+                header = self.rfile.read(4)
+                if len(header) < 4:
+                    return
+                frame = self.rfile.read(struct.unpack('!I', header)[0])
+            with self.server.lock:
+                self.server.frames.append(frame.decode())
+
+
+def free_address() -> tuple:
+    """An address nobody is listening on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()
+
+
+@pytest.mark.parametrize('framing', ['line', 'length'])
+def test_delivery(framing) -> None:
+    """Check all messages arrive (in order on a single connection) over persistent connections."""
+    collector = Collector(('127.0.0.1', 0), framing)
+    handler = NetworkHandler(level=DEBUG, resource=collector.server_address, framing=framing, pool_size=1)
+    expected = [f'message {i}' if i % 7 else f'multi\nline\\{i}' for i in range(1000)]
+    for content in expected:
+        handler.write(Message(level=INFO, content=content))
+    assert handler.flush(timeout=10)
+    if framing == 'line':  # one frame per message, escaped
+        expected = [content.replace('\\', '\\\\').replace('\n', '\\n') for content in expected]
+    assert collector.wait(len(expected)) == expected
+    handler.close()
+    stats = handler.stats
+    assert stats.sent == 1000 and stats.batches <= 1000 and stats.dropped == stats.retries == 0
+    assert collector.connections == 1
+    collector.stop()
+
+    handler = NetworkHandler(level=DEBUG, resource=collector.server_address, pool_size=4)
+    with pytest.raises(ValueError):
+        NetworkHandler(level=DEBUG, resource=collector.server_address, framing='json')
+    with pytest.raises(ValueError):
+        NetworkHandler(level=DEBUG)
+    handler.close()
+
+
+def test_spill(tmp_path) -> None:
+    """Check messages are spilled during an outage and replayed once the collector is back."""
+    address = free_address()
+    spill_path = str(tmp_path / 'spill')
+    handler = NetworkHandler(level=DEBUG, resource=address, pool_size=2, max_pending=10, spill_path=spill_path,
+                             spill_after=0, retry_initial=0.01, retry_max=0.05)
+    for i in range(200):
+        handler.write(Message(level=INFO, content=f'message {i}'))
+    assert handler.flush(timeout=10)
+    stats = handler.stats
+    assert stats.spilled == 200 and stats.sent == 0 and stats.retries > 0
+
+    collector = Collector(address)
+    assert sorted(collector.wait(200)) == sorted(f'message {i}' for i in range(200))
+    handler.write(Message(level=INFO, content='after'))
+    assert collector.wait(201)[-1] == 'after'
+    handler.close()
+    stats = handler.stats
+    assert stats.replayed == 200 and stats.sent == 201 and stats.dropped == 0
+    assert (tmp_path / 'spill').stat().st_size == 0
+    collector.stop()
+
+
+def test_spill_at_exit(tmp_path) -> None:
+    """Check messages left when closing during an outage are sent by the next run."""
+    address = free_address()
+    spill_path = str(tmp_path / 'spill')
+    handler = NetworkHandler(level=DEBUG, resource=address, spill_path=spill_path, timeout=0.2)
+    for i in range(10):
+        handler.write(Message(level=INFO, content=f'message {i}'))
+    handler.close()
+    assert handler.stats.spilled == 10
+
+    collector = Collector(address)
+    handler = NetworkHandler(level=DEBUG, resource=address, spill_path=spill_path)
+    handler.write(Message(level=INFO, content='next run'))
+    assert sorted(collector.wait(11)) == sorted(['next run'] + [f'message {i}' for i in range(10)])
+    handler.close()
+    collector.stop()
+
+
+@pytest.mark.parametrize('tail', [b'\x00\x00', struct.pack('!I', 100) + b'short'])
+def test_truncated_spill(tmp_path, tail) -> None:
+    """Check complete records are replayed from a spill file cut short (e.g., killed while writing)."""
+    address = free_address()
+    spill_path = tmp_path / 'spill'
+    records = [f'message {i}'.encode() for i in range(3)]
+    spill_path.write_bytes(b''.join(struct.pack('!I', len(record)) + record for record in records) + tail)
+
+    collector = Collector(address)
+    handler = NetworkHandler(level=DEBUG, resource=address, spill_path=str(spill_path))
+    handler.write(Message(level=INFO, content='next run'))
+    assert sorted(collector.wait(4)) == sorted(['next run'] + [record.decode() for record in records])
+    handler.write(Message(level=INFO, content='after'))
+    assert handler.flush(timeout=10) and collector.wait(5)[-1] == 'after'
+    handler.close()
+    assert handler.stats.replayed == 3 and spill_path.stat().st_size == 0
+    collector.stop()
+
+
+def test_stalled_collector() -> None:
+    """Check callers are not blocked by a collector that stops reading."""
+    collector = Collector(('127.0.0.1', 0), stalled=True)
+    handler = NetworkHandler(level=DEBUG, resource=collector.server_address, pool_size=1,
+                             max_pending=100, timeout=0.5)
+    content = 'x' * 1024
+    latency = []
+    for _ in range(20_000):  # well beyond the socket buffers
+        start = time.perf_counter()
+        handler.write(Message(level=INFO, content=content))
+        latency.append(time.perf_counter() - start)
+    assert max(latency) < 0.25
+    handler.close()
+    assert handler.stats.dropped > 0
+    collector.shutdown()
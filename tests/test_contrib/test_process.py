@@ -0,0 +1,87 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for publishing messages from other processes."""
+
+
+# standard libs
+import pickle
+import multiprocessing
+from io import StringIO
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.level import DEBUG, INFO
+from logalpha.message import Message
+from logalpha.handler import Handler, StreamHandler
+from logalpha.contrib.standard import StandardMessage, StandardHandler, HOST
+from logalpha.contrib.process import (encode, decode, ProcessHandler, ProcessListener,
+                                      UnixSocketHandler, UnixSocketListener)
+
+
+@dataclass
+class InMemoryHandler(StreamHandler):
+    """Messages written to in-memory `io.StringIO`."""
+
+    resource: StringIO = None
+
+    def format(self, message: Message) -> str:
+        return f'{message.level.name}: {message.content}'
+
+
+def test_encode() -> None:
+    """Check messages are encoded without cached formatting."""
+    message = StandardMessage(level=INFO, content='message', timestamp=1_602_535_690_555_000_000,
+                              topic='topic', host=HOST)
+    StandardHandler().format_cached(message)
+    record = pickle.loads(pickle.dumps(encode(message)))
+    assert record == (StandardMessage, (INFO, 'message', 1_602_535_690_555_000_000, 'topic', HOST))
+    assert decode(record) == message
+
+
+def worker(handler: Handler, name: str) -> None:
+    """Write a few messages with `handler`."""
+    for i in range(10):
+        handler.write(Message(level=INFO, content=f'{name}-{i}'))
+
+
+def run_workers(handler: Handler) -> None:
+    """Run a few workers to completion."""
+    processes = [multiprocessing.Process(target=worker, args=(handler, str(n))) for n in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def expected_lines() -> list:
+    """All messages written by `run_workers`."""
+    return sorted(f'INFO: {n}-{i}' for n in range(4) for i in range(10))
+
+
+def test_process_queue() -> None:
+    """Check messages from other processes are published by the listener."""
+    target = InMemoryHandler(level=DEBUG, resource=StringIO())
+    listener = ProcessListener([target])
+    listener.start()
+    run_workers(ProcessHandler(level=DEBUG, resource=listener.queue))
+    listener.stop()
+    assert sorted(target.resource.getvalue().splitlines()) == expected_lines()
+
+
+def test_unix_socket(tmp_path) -> None:
+    """Check messages from other processes are published by the listener."""
+    target = InMemoryHandler(level=DEBUG, resource=StringIO())
+    listener = UnixSocketListener(str(tmp_path / 'test.sock'), [target])
+    listener.start()
+    run_workers(UnixSocketHandler(level=DEBUG, resource=listener.path))
+    listener.stop()
+    assert sorted(target.resource.getvalue().splitlines()) == expected_lines()
+    assert not (tmp_path / 'test.sock').exists()
@@ -0,0 +1,133 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for QueueHandler and QueueListener."""
+
+
+# standard libs
+import time
+import threading
+from queue import Queue
+from io import StringIO
+from dataclasses import dataclass
+
+# internal libs
+from logalpha.level import LEVELS, DEBUG, INFO, ERROR
+from logalpha.message import Message
+from logalpha.handler import StreamHandler
+from logalpha.contrib.queue import QueueHandler, BLOCK, DROP_NEWEST, DROP_OLDEST, DROP_BELOW
+
+# external libs
+from hypothesis import given, strategies as st
+import pytest
+
+
+@dataclass
+class InMemoryHandler(StreamHandler):
+    """Messages written to in-memory `io.StringIO`."""
+
+    resource: StringIO = None
+
+    def format(self, message: Message) -> str:
+        return f'{message.level.name}: {message.content}'
+
+
+@dataclass
+class BlockingHandler(InMemoryHandler):
+    """Wait on `event` before each write."""
+
+    event: threading.Event = None
+
+    def write(self, message: Message) -> None:
+        self.event.wait()
+        super().write(message)
+
+
+@given(st.lists(st.text(min_size=1), max_size=20))
+def test_order(contents) -> None:
+    """Check all messages are published in order on close."""
+    target = InMemoryHandler(level=DEBUG, resource=StringIO())
+    handler = QueueHandler(handler=target)
+    assert handler.level is DEBUG
+    for content in contents:
+        handler.write(Message(level=INFO, content=content))
+    handler.close()
+    assert handler.listener._thread is None  # noqa: protected
+    assert target.resource.getvalue() == ''.join(f'INFO: {content}\n' for content in contents)
+    handler.write(Message(level=INFO, content='late'))  # published directly once closed
+    assert target.resource.getvalue().endswith('INFO: late\n')
+
+
+@pytest.mark.parametrize('overflow, expected, dropped', [
+    (DROP_NEWEST, ['0', '1'], {'DEBUG': 1, 'ERROR': 1}),
+    (DROP_OLDEST, ['2', '3'], {'DEBUG': 1, 'ERROR': 1}),
+    (DROP_BELOW, ['0', '1', '3'], {'DEBUG': 1}),
+])
+def test_overflow(overflow: str, expected: list, dropped: dict) -> None:
+    """Check overflow policies with a full queue."""
+    event = threading.Event()
+    target = BlockingHandler(level=DEBUG, resource=StringIO(), event=event)
+    handler = QueueHandler(handler=target, maxsize=2, overflow=overflow, drop_level=INFO)
+    handler.write(Message(level=DEBUG, content='blocked'))  # held by the worker
+    while not handler.resource.empty():
+        pass
+    handler.write(Message(level=DEBUG, content='0'))
+    handler.write(Message(level=ERROR, content='1'))
+    handler.write(Message(level=DEBUG, content='2'))
+    if overflow == DROP_BELOW:
+        threading.Timer(0.1, event.set).start()  # ERROR waits for space
+    handler.write(Message(level=ERROR, content='3'))
+    event.set()
+    handler.close()
+    published = target.resource.getvalue().strip().split('\n')[1:]
+    assert [line.split(': ')[1] for line in published] == expected
+    assert handler.dropped == dropped
+
+
+class SlowQueue(Queue):
+    """Pause before putting a message (to widen the window for a concurrent close)."""
+
+    def put_nowait(self, item) -> None:
+        time.sleep(0.001)
+        super().put_nowait(item)
+
+
+def test_close_under_load() -> None:
+    """Check no message is lost when closing while other threads write."""
+    for _ in range(10):
+        target = InMemoryHandler(level=DEBUG, resource=StringIO(), locked=True)
+        handler = QueueHandler(handler=target, resource=SlowQueue())
+        start = threading.Barrier(5)
+
+        def produce() -> None:
+            start.wait()
+            for i in range(20):
+                handler.write(Message(level=INFO, content=i))
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(0.005)
+        handler.close()
+        for thread in threads:
+            thread.join()
+        assert len(target.resource.getvalue().splitlines()) == 80
+
+
+def test_invalid() -> None:
+    """Check argument validation."""
+    with pytest.raises(ValueError):
+        QueueHandler()
+    with pytest.raises(ValueError):
+        QueueHandler(handler=InMemoryHandler(level=DEBUG), overflow='other')
+    with pytest.raises(ValueError):
+        QueueHandler(handler=InMemoryHandler(level=DEBUG), overflow=DROP_BELOW)
+    assert BLOCK == QueueHandler(handler=InMemoryHandler(level=LEVELS[0])).overflow
@@ -0,0 +1,63 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for RingBufferHandler."""
+
+
+# standard libs
+import tempfile
+
+# internal libs
+from logalpha.level import INFO
+from logalpha.message import Message
+from logalpha.contrib.ring import RingBufferHandler, read
+
+# external libs
+from hypothesis import given, settings, strategies as st
+import pytest
+
+
+@settings(deadline=None)
+@given(contents=st.lists(st.text(max_size=40)), size=st.integers(min_value=8, max_value=200))
+def test_ring_buffer(contents, size) -> None:
+    """Check the most recent messages are read back in order."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = f'{tmpdir}/test.ring'
+        handler = RingBufferHandler(path=path, size=size)
+        for content in contents:
+            handler.write(Message(level=INFO, content=content))
+        records = list(read(path, encoding=None))
+        handler.close()
+
+        expected = [content.encode()[:size - 4] for content in contents]
+        assert records == expected[len(expected) - len(records):]
+        assert sum(4 + len(record) for record in records) <= size
+        if contents:  # the newest record is always kept
+            assert records
+
+
+def test_reopen(tmp_path) -> None:
+    """Check an existing buffer is reused (or reset if the size differs)."""
+    path = str(tmp_path / 'test.ring')
+    handler = RingBufferHandler(path=path, size=64)
+    handler.write(Message(level=INFO, content='a'))
+    handler.close()  # e.g., the process exited
+
+    handler = RingBufferHandler(path=path, size=64)
+    handler.write(Message(level=INFO, content='b'))
+    assert list(read(path)) == ['a', 'b']
+    handler.close()
+
+    handler = RingBufferHandler(path=path, size=128)
+    assert list(read(path)) == []
+    handler.close()
+
+    with pytest.raises(ValueError):
+        RingBufferHandler(size=64)
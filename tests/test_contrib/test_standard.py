@@ -16,7 +16,8 @@ from io import StringIO
 from string import ascii_letters
 
 # internal libs
-from logalpha.contrib.standard import StandardHandler, StandardLogger, HOST
+from logalpha.contrib.standard import StandardHandler, StandardLogger, StandardMessage, HOST, INFO
+from logalpha.timestamp import WALL_NS, MONOTONIC_NS
 
 # external libs
 from hypothesis import given, strategies as st
@@ -39,3 +40,20 @@ def test_logger(topic: str, handler_level: int, message_level: int, text: str) -
     else:
         expected = f' {HOST} {log.levels[message_level].name:<8} [{topic}] {text}'
         assert buffer.getvalue().strip().endswith(expected)
+
+
+def test_clock() -> None:
+    """Check integer nanosecond clocks produce the same output."""
+    for clock in (WALL_NS, MONOTONIC_NS):
+        log = StandardLogger('topic', clock=clock)
+        buffer = StringIO()
+        log.handlers.clear()
+        log.handlers.append(StandardHandler(resource=buffer))
+        log.warning('message')
+        date, time, *rest = buffer.getvalue().split()
+        assert len(date) == 10 and len(time) == 12
+        assert rest == [HOST, 'WARNING', '[topic]', 'message']
+
+    message = StandardMessage(INFO, 'message', 1602535690555000000, 'topic', HOST)
+    assert message.datetime is message.datetime  # cached
+    assert message.datetime.microsecond == 555000
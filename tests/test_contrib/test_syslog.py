@@ -0,0 +1,82 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Unit tests for SyslogHandler against a local stand-in for the agent."""
+
+
+# standard libs
+import socket
+
+# internal libs
+from logalpha.level import Level, LEVELS, DEBUG, INFO, WARNING, ERROR
+from logalpha.message import Message
+from logalpha.contrib.ok import OkayLogger, OK, ERR
+from logalpha.contrib.syslog import SyslogHandler, LOG_LOCAL0, LOG_ERR
+
+
+def agent(path: str) -> socket.socket:
+    """Bind a datagram socket at `path`."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server.bind(path)
+    server.settimeout(5)
+    return server
+
+
+def test_unix_socket(tmp_path) -> None:
+    """Check priorities for each level and reconnecting after the agent restarts."""
+    path = str(tmp_path / 'log')
+    server = agent(path)
+    handler = SyslogHandler(level=DEBUG, resource=path, ident='test', facility=LOG_LOCAL0)
+    for level in LEVELS:
+        handler.write(Message(level=level, content=level.name.lower()))
+    assert [server.recv(4096) for _ in LEVELS] == [b'<135>test: debug', b'<134>test: info', b'<132>test: warning',
+                                                   b'<131>test: error', b'<130>test: critical']
+    sock = handler._socket  # noqa: protected
+    handler.write(Message(level=INFO, content='again'))
+    assert handler._socket is sock and server.recv(4096) == b'<134>test: again'  # noqa: protected
+
+    server.close()
+    (tmp_path / 'log').unlink()
+    server = agent(path)
+    handler.write(Message(level=INFO, content='restarted'))
+    assert server.recv(4096) == b'<134>test: restarted'
+
+    # not in the table (or another name for the same value)
+    for level in (ERR, Level('TRACE', 9), Level('Custom', -1)):
+        handler.write(Message(level=level, content=level.name.lower()))
+    assert [server.recv(4096) for _ in range(3)] == [b'<131>test: err', b'<135>test: trace', b'<133>test: custom']
+
+    handler.levels = OkayLogger.levels
+    handler.severities = {'Err': LOG_ERR}
+    handler.write(Message(level=ERR, content='custom'))
+    handler.write(Message(level=OK, content='default'))
+    assert [server.recv(4096) for _ in range(2)] == [b'<131>test: custom', b'<133>test: default']
+    handler.close()
+    server.close()
+
+
+def test_batched() -> None:
+    """Check messages are packed into datagrams up to the maximum size over UDP."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(5)
+    handler = SyslogHandler(level=DEBUG, resource=server.getsockname(), ident='test', batched=True,
+                            max_size=40, flush_interval=60)
+    for content in ['a', 'b', 'c']:  # '<14>test: a' is 11 bytes
+        handler.write(Message(level=INFO, content=content))
+    handler.write(Message(level=WARNING, content='d'))  # would exceed 40 bytes
+    assert server.recv(4096) == b'<14>test: a\n<14>test: b\n<14>test: c'
+    handler.write(Message(level=ERROR, content='e'))  # sent immediately with the batch
+    assert server.recv(4096) == b'<12>test: d\n<11>test: e'
+    handler.write(Message(level=INFO, content='f'))
+    handler.flush()
+    assert server.recv(4096) == b'<14>test: f'
+    handler.close()
+    server.close()
@@ -0,0 +1,212 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Filter unit tests."""
+
+# standard libs
+import time
+from io import StringIO
+from types import SimpleNamespace
+from dataclasses import dataclass
+
+# internal libs
+from logalpha import filter as filter_module
+from logalpha.filter import RateLimit, Sample, FirstThenEvery, FilterHandler, CollapseHandler, MatchHandler
+from logalpha.handler import StreamHandler
+from logalpha.message import Message
+from logalpha.level import DEBUG, INFO, WARNING, ERROR
+from logalpha.logger import Logger
+from logalpha.contrib.standard import StandardLogger, StandardMessage
+
+# external libs
+from hypothesis import given, strategies as st
+import pytest
+
+
+@dataclass
+class CountingHandler(StreamHandler):
+    """Messages written to in-memory `io.StringIO`, counting calls to `format`."""
+
+    resource: StringIO = None
+    formatted: int = 0
+
+    def format(self, message: Message) -> str:
+        self.formatted += 1
+        return f'{message.level.name}: {message.content}'
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    """Replace the clock used by filters with one that only moves when told to."""
+    clock = SimpleNamespace(now=time.monotonic() + 3600)  # reports are never due for the background flusher
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(filter_module, 'time', clock)
+    return clock
+
+
+def test_rate_limit(clock) -> None:
+    """Check the token bucket for each key."""
+    limit = RateLimit(rate=2, burst=3, key='level')
+    accepted = [limit(Message(level=ERROR, content=i)) for i in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert limit(Message(level=INFO, content='other key'))
+    clock.now += 1  # two more tokens
+    assert [limit(Message(level=ERROR, content=i)) for i in range(3)] == [True, True, False]
+    clock.now += 60
+    assert limit(Message(level=ERROR, content='after')) and limit.suppressed == 3
+
+    limit = RateLimit(rate=1, burst=1, key='topic')  # not a field of Message
+    assert [limit(Message(level=INFO, content=i)) for i in range(3)] == [True, False, False]
+
+
+@given(st.integers(min_value=1, max_value=20), st.integers(min_value=1, max_value=10))
+def test_first_then_every(first, every) -> None:
+    """Check the first messages are published and then every n-th message."""
+    thin = FirstThenEvery(first=first, every=every, key='content')
+    accepted = [i for i in range(100) if thin(Message(level=INFO, content='same'))]
+    assert accepted == list(range(first)) + list(range(first + every - 1, 100, every))
+    assert thin(Message(level=INFO, content='different'))
+    assert thin.suppressed == 100 - len(accepted)
+
+
+def test_sample() -> None:
+    """Check the fraction of sampled messages and levels the filter applies to."""
+    sample = Sample(probability=0.25, levels=[DEBUG])
+    accepted = sum(sample(Message(level=DEBUG, content=i)) for i in range(10_000))
+    assert 2000 < accepted < 3000
+    assert all(sample(Message(level=INFO, content=i)) for i in range(100))
+    assert Sample(probability=0)(Message(level=INFO, content='')) is False
+    sample.levels = None
+    assert sum(sample(Message(level=INFO, content=i)) for i in range(1000)) < 500
+
+
+def test_logger(clock) -> None:
+    """Check suppressed messages are not formatted and are reported periodically."""
+
+    class FilteredLogger(Logger, scoped=True):
+        """Don't share handlers with other tests."""
+
+    handler = CountingHandler(level=DEBUG, resource=StringIO())
+    FilteredLogger.handlers.append(handler)
+    log = FilteredLogger()
+    log.filters = [FirstThenEvery(first=2, every=5, key='level', report_interval=10)]
+    for i in range(20):
+        log.error('failed {}', i)
+    log.info('ok')
+    assert handler.formatted == 2 + 3 + 1
+    clock.now += 10
+    log.error('failed again')  # suppressed, but the report is due
+    log.error('failed again')  # the count starts over (the 21st is published)
+    log.error('failed again')
+    clock.now += 10
+    log.info('done')
+    assert handler.resource.getvalue().splitlines() == [
+        'ERROR: failed 0', 'ERROR: failed 1', 'ERROR: failed 6', 'ERROR: failed 11', 'ERROR: failed 16', 'INFO: ok',
+        'WARNING: FirstThenEvery suppressed 16 messages (ERROR: 16)',
+        'ERROR: failed again', 'WARNING: FirstThenEvery suppressed 1 messages (ERROR: 1)', 'INFO: done']
+    child = log.child()
+    assert child.filters is log.filters
+    assert Logger.filters == () and FilteredLogger.filters == ()
+
+
+def test_report_without_traffic() -> None:
+    """Check reports are published by the background flusher once due, without new messages."""
+
+    class FilteredLogger(Logger, scoped=True):
+        """Don't share handlers with other tests."""
+
+        filters = [RateLimit(rate=1, burst=1, report_interval=0.05)]
+
+    handler = CountingHandler(level=DEBUG, resource=StringIO())
+    FilteredLogger.handlers.append(handler)
+    log = FilteredLogger()
+    for i in range(5):
+        log.error('failed {}', i)
+    assert handler.resource.getvalue().splitlines() == ['ERROR: failed 0']
+    for _ in range(100):
+        if handler.formatted == 2:
+            break
+        time.sleep(0.01)
+    assert handler.resource.getvalue().splitlines() == ['ERROR: failed 0', 'WARNING: RateLimit suppressed 4 messages']
+
+
+def test_filter_handler(clock) -> None:
+    """Check filters apply to the target only."""
+    target = CountingHandler(level=INFO, resource=StringIO())
+    other = CountingHandler(level=INFO, resource=StringIO())
+    handler = FilterHandler(resource=[RateLimit(rate=1, burst=1, report_interval=0, report_level=WARNING)],
+                            target=target)
+    assert handler.level is INFO
+    for i in range(3):
+        message = Message(level=ERROR, content=i)
+        for each in (handler, other):
+            each.write(message)
+    assert target.formatted == other.formatted == 3  # one message and two reports
+    assert target.resource.getvalue().splitlines() == ['ERROR: 0', 'WARNING: RateLimit suppressed 1 messages',
+                                                       'WARNING: RateLimit suppressed 1 messages']
+    with pytest.raises(ValueError):
+        FilterHandler(resource=[])
+
+
+def test_collapse_handler() -> None:
+    """Check consecutive identical messages are collapsed into a summary."""
+    target = CountingHandler(level=INFO, resource=StringIO())
+    handler = CollapseHandler(target=target, flush_interval=0.05)
+    messages = [(INFO, 'a', 'start')] + [(ERROR, 'a', 'failed')] * 1000 + [(ERROR, 'b', 'failed')] * 2
+    for level, topic, content in messages + [(INFO, 'a', 'done')]:
+        handler.write(StandardMessage(level=level, content=content, timestamp=0, topic=topic, host='host'))
+    assert target.resource.getvalue().splitlines() == [
+        'INFO: start', 'ERROR: failed', 'ERROR: Last message repeated 999 times',
+        'ERROR: failed', 'ERROR: Last message repeated 1 times', 'INFO: done']
+    assert target.formatted == 6
+
+    target.resource = StringIO()
+    for _ in range(3):
+        handler.write(Message(level=INFO, content='done'))
+    handler.write(Message(level=WARNING, content='done'))
+    handler.write(Message(level=WARNING, content='done'))
+    time.sleep(0.5)  # summary by the background flusher
+    assert target.resource.getvalue().splitlines() == [
+        'INFO: done', 'INFO: Last message repeated 2 times', 'WARNING: done', 'WARNING: Last message repeated 1 times']
+    with pytest.raises(ValueError):
+        CollapseHandler()
+
+
+def test_match_handler() -> None:
+    """Check topics and level range, decided in advance for static topics."""
+
+    class MatchLogger(StandardLogger, scoped=True):
+        """Don't share handlers with other tests."""
+
+    target = CountingHandler(level=DEBUG, resource=StringIO())
+    handler = MatchHandler(resource=['app.db*'], max_level=INFO, target=target)
+    calls = []
+    handler.write = lambda message: (calls.append(message.content), MatchHandler.write(handler, message))
+    MatchLogger.handlers.append(handler)
+    log = MatchLogger('app.db')
+    for each in (log, log.child(topic='app.db.pool'), log.child(topic='app.web')):
+        each.debug('debug')
+        each.info('info')
+        each.warning('warning')
+    assert calls == ['debug', 'info'] * 2  # others were not dispatched to the handler
+    assert target.resource.getvalue() == 'DEBUG: debug\nINFO: info\n' * 2
+
+    rendered = []
+    log.child(topic='web').debug(lambda: rendered.append('web') or 'web')  # no handler for the topic
+    log.debug(lambda: rendered.append('db') or 'db')
+    assert rendered == ['db'] and calls[-1] == 'db'
+
+    handler.max_level = None
+    log.warning('warning')
+    log.callbacks = {**log.callbacks, 'topic': lambda: 'app.web'}  # no longer static
+    log.fields = {key: value for key, value in log.fields.items() if key != 'topic'}
+    log.info('dynamic')
+    assert calls[-2:] == ['warning', 'dynamic']
+    assert target.resource.getvalue().splitlines()[-1] == 'WARNING: warning'
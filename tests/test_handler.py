@@ -14,12 +14,14 @@
 from typing import Dict
 
 # standard libs
+import time
+import threading
 from io import StringIO
 from queue import Queue
 from dataclasses import dataclass
 
 # internal libs
-from logalpha.handler import Handler, StreamHandler
+from logalpha.handler import Handler, StreamHandler, HandlerList
 from logalpha.message import Message
 from logalpha.level import LEVELS
 from logalpha.logger import Logger
@@ -74,9 +76,12 @@ class QueueHandler(Handler):
 def test_derived_handler() -> None:
     """Test derived queue handler."""
 
+    class IsolatedLogger(Logger, scoped=True):
+        """Don't share handlers with other tests."""
+
     resource = Queue()
     handler = QueueHandler(level=LEVELS[1], resource=resource)
-    log = Logger()
+    log = IsolatedLogger()
     log.handlers.append(handler)
 
     getattr(log, LEVELS[0].name.lower())('message')  # send to DEBUG
@@ -88,3 +93,195 @@ def test_derived_handler() -> None:
         message = resource.get()
         assert message == {'level': level.name, 'content': 'message'}
         assert resource.empty()
+
+
+def test_buffered() -> None:
+    """Check lines are batched until a threshold is reached."""
+
+    handler = InMemoryHandler(level=LEVELS[0], resource=StringIO(), buffered=True,
+                              buffer_lines=3, flush_interval=60)
+    handler.write(Message(level=LEVELS[0], content='a'))
+    handler.write(Message(level=LEVELS[1], content='b'))
+    assert handler.resource.getvalue() == ''
+    handler.write(Message(level=LEVELS[1], content='c'))
+    assert handler.resource.getvalue() == 'DEBUG: a\nINFO: b\nINFO: c\n'
+
+    handler.write(Message(level=LEVELS[0], content='d'))
+    assert handler.resource.getvalue().endswith('c\n')
+    handler.write(Message(level=LEVELS[3], content='e'))  # ERROR flushes immediately
+    assert handler.resource.getvalue().endswith('DEBUG: d\nERROR: e\n')
+
+    handler.buffer_bytes = 10
+    handler.write(Message(level=LEVELS[0], content='f'))
+    assert handler.resource.getvalue().endswith('e\n')
+    handler.write(Message(level=LEVELS[0], content='g'))  # over 10 characters
+    assert handler.resource.getvalue().endswith('DEBUG: f\nDEBUG: g\n')
+
+    handler.write(Message(level=LEVELS[0], content='h'))
+    handler.flush()
+    assert handler.resource.getvalue().endswith('g\nDEBUG: h\n')
+
+
+def test_buffered_interval() -> None:
+    """Check stale batches are flushed in the background."""
+
+    handler = InMemoryHandler(level=LEVELS[0], resource=StringIO(), buffered=True, flush_interval=0.05)
+    handler.write(Message(level=LEVELS[0], content='a'))
+    assert handler.resource.getvalue() == ''
+    for _ in range(100):
+        if handler.resource.getvalue():
+            break
+        time.sleep(0.01)
+    assert handler.resource.getvalue() == 'DEBUG: a\n'
+
+
+@dataclass
+class CountingHandler(InMemoryHandler):
+    """Count calls to format."""
+
+    calls = []
+    format_fields = ()  # output only depends on the message
+
+    def format(self, message: Message) -> str:
+        self.calls.append(message)
+        return super().format(message)
+
+
+@dataclass
+class PrefixHandler(CountingHandler):
+    """New attribute `prefix` affects the format."""
+
+    prefix: str = ''
+
+    def format(self, message: Message) -> str:
+        return self.prefix + super().format(message)
+
+
+def test_format_cached() -> None:
+    """Check formatting is shared between equivalent handlers."""
+
+    CountingHandler.calls.clear()
+    handlers = [CountingHandler(level=LEVELS[0], resource=StringIO()) for _ in range(4)]
+    message = Message(level=LEVELS[1], content='message')
+    for handler in handlers:
+        handler.write(message)
+        assert handler.resource.getvalue() == 'INFO: message\n'
+    assert len(CountingHandler.calls) == 1
+
+    assert PrefixHandler.format_fields is None  # not shared by default
+    handlers = [PrefixHandler(level=LEVELS[0], resource=StringIO(), prefix=prefix) for prefix in 'ab']
+    for handler in handlers:
+        handler.write(message)
+    assert [handler.resource.getvalue() for handler in handlers] == ['aINFO: message\n', 'bINFO: message\n']
+
+
+class TaggedHandler(InMemoryHandler):
+    """Plain attribute set in `__init__` affects the format."""
+
+    def __init__(self, tag: str) -> None:
+        super().__init__(level=LEVELS[0], resource=StringIO())
+        self.tag = tag
+
+    def format(self, message: Message) -> str:
+        return f'[{self.tag}] {message.content}'
+
+
+def test_format_not_shared_by_default() -> None:
+    """Check handlers that do not declare `format_fields` format each message themselves."""
+
+    assert InMemoryHandler.format_fields is None and TaggedHandler.format_fields is None
+    handlers = [TaggedHandler(tag) for tag in 'ab']
+    message = Message(level=LEVELS[1], content='message')
+    for handler in handlers:
+        handler.write(message)
+    assert [handler.resource.getvalue() for handler in handlers] == ['[a] message\n', '[b] message\n']
+
+
+def test_handler_list() -> None:
+    """Check handlers can be changed while other threads iterate."""
+
+    class ScopedLogger(Logger, scoped=True):
+        """Own handlers."""
+
+    class DerivedLogger(ScopedLogger):
+        """Shares handlers with ScopedLogger."""
+
+    assert ScopedLogger.handlers is not Logger.handlers and DerivedLogger.handlers is ScopedLogger.handlers
+
+    handlers = ScopedLogger.handlers
+    first = InMemoryHandler(level=LEVELS[3], resource=StringIO())
+    handlers.append(first)
+    snapshot = handlers.snapshot
+    handlers.append(InMemoryHandler(level=LEVELS[1], resource=StringIO()))
+    assert snapshot == (first,) and len(handlers) == 2 and handlers.min_value == 1
+    handlers.replace([first])
+    assert handlers == [first] and handlers.min_value == 3
+
+    log = DerivedLogger()
+    stop = threading.Event()
+
+    def reconfigure() -> None:
+        while not stop.is_set():
+            handler = InMemoryHandler(level=LEVELS[0], resource=StringIO())
+            handlers.append(handler)
+            handlers.remove(handler)
+
+    threads = [threading.Thread(target=reconfigure) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(10_000):
+        log.error('message')
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert handlers == [first] and handlers.min_value == 3
+    assert first.resource.getvalue() == 'ERROR: message\n' * 10_000
+
+
+def test_dispatch() -> None:
+    """Check the dispatch table by level value follows changes to the handlers and their levels."""
+    handlers = HandlerList([InMemoryHandler(level=level, resource=StringIO()) for level in LEVELS[::-1]])
+    for level in LEVELS:
+        assert handlers.dispatch(level.value) == tuple(handler for handler in handlers if level >= handler.level)
+        assert handlers.dispatch(level.value) is handlers.dispatch(level.value)
+    fields = {'topic': 'app'}
+    assert handlers.dispatch(2, fields) == handlers.dispatch(2) and handlers.dispatch(2, fields) is not handlers.dispatch(2)
+    last = handlers[-1]
+    last.level = LEVELS[4]
+    assert last not in handlers.dispatch(2) and last not in handlers.dispatch(2, fields)
+    handlers.remove(handlers[0])
+    assert handlers.dispatch(4) == handlers.snapshot
+    assert handlers.dispatch(-1) == ()
+
+
+class SlowResource:
+    """Record each call to `write` and take some time doing it."""
+
+    def __init__(self) -> None:
+        self.writes = []
+
+    def write(self, text: str) -> None:
+        time.sleep(0.001)
+        self.writes.append(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def test_locked() -> None:
+    """Check each line is a single write and lock contention is recorded."""
+
+    handler = InMemoryHandler(level=LEVELS[0], resource=SlowResource(), locked=True)
+    threads = [threading.Thread(target=lambda: [handler.write(Message(level=LEVELS[1], content=str(i)))
+                                                for i in range(20)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(handler.resource.writes) == 80
+    assert all(text.startswith('INFO: ') and text.endswith('\n') for text in handler.resource.writes)
+    stats = handler.lock_stats
+    assert stats.acquired == 80 and stats.waiters == 0
+    assert 0 < stats.contended <= 80 and stats.wait_time > 0 and 1 <= stats.max_waiters <= 4
@@ -11,20 +11,25 @@
 """Logger unit tests."""
 
 # type annotations
-from typing import Type
+from typing import Type, Any
 
 # standard libs
+import gc
+import os
+import weakref
+import asyncio
 from io import StringIO
 from string import ascii_letters
 from dataclasses import dataclass
 
 # internal libs
-from logalpha.handler import StreamHandler
+from logalpha.handler import StreamHandler, AsyncStreamHandler
 from logalpha.message import Message
 from logalpha.level import Level, LEVELS
-from logalpha.logger import Logger
+from logalpha.logger import Logger, AsyncLogger
 
 # external libs
+import pytest
 from hypothesis import given, assume, strategies as st
 
 
@@ -96,3 +101,177 @@ def test_named_logger(topic: str, handler_level: int, message_level: int) -> Non
     log.handlers.append(handler)
     getattr(log, LEVELS[message_level].name.lower())('message')
     assert buffer.getvalue().strip() == f'{LEVELS[message_level].name} [{topic}] message'
+
+
+def test_suppressed_skips_callbacks() -> None:
+    """Check callbacks are not evaluated for levels below every handler."""
+
+    calls = []
+
+    class CountingLogger(Logger):
+        """Count calls to the topic callback."""
+
+        Message: Type[Message] = MessageWithTopic
+        callbacks = {'topic': (lambda: calls.append(None) or 'topic')}
+
+    log = CountingLogger()
+    buffer = StringIO()
+    handler = DetailedHandler(level=LEVELS[2], resource=buffer)
+    log.handlers.clear()
+    log.handlers.append(handler)
+    assert log.handlers.min_value == 2
+
+    log.debug('message')
+    log.info('message')
+    assert not calls and buffer.getvalue() == ''
+
+    handler.level = LEVELS[0]  # min level is refreshed automatically
+    assert log.handlers.min_value == 0
+    log.debug('message')
+    assert len(calls) == 1 and buffer.getvalue().strip() == 'DEBUG [topic] message'
+
+    log.handlers.remove(handler)
+    assert log.handlers.min_value == float('inf')
+    log.critical('message')
+    assert len(calls) == 1
+
+
+def test_suppressed_skips_write() -> None:
+    """Check level methods return before calling write for levels below every handler."""
+
+    class StrictLogger(Logger):
+        """Fail on any call to write."""
+
+        def write(self, level: Level, content: Any, *args: Any, **kwargs: Any) -> None:
+            raise AssertionError(f'write called for {level.name}')
+
+    log = StrictLogger()
+    log.handlers.clear()
+    log.handlers.append(DetailedHandler(level=LEVELS[3], resource=StringIO()))
+    assert log.debug('message') is None
+    assert log.info('message') is None
+    with pytest.raises(AssertionError):
+        log.error('message')
+
+    async def main() -> None:
+        log = AsyncLogger()
+        log.handlers.clear()
+        await log.debug('message')  # nothing to write but still awaitable
+
+    asyncio.run(main())
+
+
+@dataclass
+class AsyncInMemoryHandler(AsyncStreamHandler, InMemoryHandler):
+    """Same format as InMemoryHandler but asynchronous."""
+
+
+def test_async_logger() -> None:
+    """Check awaited and fire-and-forget level methods."""
+
+    async def main() -> bytes:
+        read_fd, write_fd = os.pipe()
+        handler = await AsyncInMemoryHandler.from_file(os.fdopen(write_fd, mode='wb'), level=LEVELS[1])
+        log = AsyncLogger()
+        log.handlers.clear()
+        log.handlers.append(handler)
+        await log.debug('a')
+        await log.info('b')
+        log.warning_nowait('c')
+        log.debug_nowait('d')
+        await log.error('e')
+        handler.resource.close()
+        await asyncio.sleep(0)
+        with os.fdopen(read_fd, mode='rb') as stream:
+            return stream.read()
+
+    assert asyncio.run(main()) == b'INFO: b\nWARNING: c\nERROR: e\n'
+    assert 'handlers' in AsyncLogger.__dict__ and AsyncLogger.handlers is not Logger.handlers
+
+
+class Counted:
+    """Count the number of times this object is formatted."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __format__(self, spec: str) -> str:
+        self.count += 1
+        return 'counted'
+
+
+def test_deferred_content() -> None:
+    """Check templates and callables are rendered once and only if accepted."""
+
+    log = Logger()
+    buffers = [StringIO(), StringIO()]
+    log.handlers.clear()
+    log.handlers.extend([InMemoryHandler(level=LEVELS[1], resource=buffer) for buffer in buffers])
+
+    value = Counted()
+    log.debug('value is {}', value)
+    log.debug(lambda: f'value is {value}')
+    assert value.count == 0
+
+    log.info('value is {0} ({extra})', value, extra=1)
+    assert value.count == 1
+    log.info(lambda: f'value is {value}')
+    assert value.count == 2
+    for buffer in buffers:
+        assert buffer.getvalue() == 'INFO: value is counted (1)\nINFO: value is counted\n'
+
+    log.info('braces {} kept without arguments')
+    assert buffers[0].getvalue().endswith('INFO: braces {} kept without arguments\n')
+
+
+def test_level_methods() -> None:
+    """Check level methods are defined on the class and short-lived loggers are released."""
+
+    assert 'info' in Logger.__dict__ and 'info_nowait' in AsyncLogger.__dict__
+    assert 'info_nowait' not in Logger.__dict__
+
+    class OtherLogger(Logger):
+        """Replace the inherited levels."""
+
+        levels = Level.from_names(['Ok', 'Err'])
+
+    log = OtherLogger()
+    assert log.ok.__func__ is OtherLogger.ok and not hasattr(log, 'info')
+
+    log.levels = Level.from_names(['Other'])  # not instrumented, resolved on demand
+    assert log.other.__func__.level.name == 'Other'
+
+    log = Logger()
+    log.handlers.clear()
+    log.handlers.append(InMemoryHandler(level=LEVELS[4], resource=StringIO()))
+    refs = []
+    for i in range(1_000_000):
+        log = NamedLogger('topic')
+        log.info('message')
+        if i % 100_000 == 0:
+            refs.append(weakref.ref(log))
+    del log
+    gc.collect()
+    assert not any(ref() for ref in refs)
+
+
+def test_child() -> None:
+    """Check child loggers share configuration with fields replaced."""
+
+    log = NamedLogger('parent')
+    buffer = StringIO()
+    log.handlers.clear()
+    log.handlers.append(DetailedHandler(level=LEVELS[0], resource=buffer))
+
+    child = log.child(topic='child')  # callback becomes a static field
+    assert type(child) is NamedLogger and child.handlers is log.handlers
+    assert child.fields == {'topic': 'child'} and not child.callbacks and log.callbacks
+    grandchild = child.child(topic='grandchild')
+    assert grandchild._factory is child._factory and grandchild.callbacks is child.callbacks
+    grandchild.info('baz')
+    child.info('foo')
+    log.info('bar')
+    assert buffer.getvalue() == 'INFO [grandchild] baz\nINFO [child] foo\nINFO [parent] bar\n'
+
+    with pytest.raises(TypeError):
+        log.child(other='value')
@@ -12,10 +12,11 @@
 
 # standard libs
 from string import ascii_letters
+from dataclasses import dataclass
 
 # internal libs
-from logalpha.message import Message
-from logalpha.level import LEVELS
+from logalpha.message import Message, compile_factory
+from logalpha.level import Level, LEVELS
 
 # external libs
 from hypothesis import given, strategies as st
@@ -28,3 +29,51 @@ def test_init(content: str) -> None:
         message = Message(level=level, content=content)
         assert message.level is level
         assert message.content is content
+
+
+def test_slots() -> None:
+    """Check messages do not carry an instance dictionary."""
+    message = Message(level=LEVELS[0], content='message')
+    assert not hasattr(message, '__dict__')
+
+
+@dataclass
+class MessageWithFields(Message):
+    """A message with additional fields."""
+    __slots__ = ('topic', 'count')
+    level: Level
+    content: str
+    topic: str
+    count: int
+
+
+@dataclass
+class MessageWithDefault(MessageWithFields):
+    """A message with a default field (cannot use slots)."""
+    level: Level
+    content: str
+    topic: str
+    count: int
+    extra: str = 'default'
+
+
+@given(topic=st.text(ascii_letters), count=st.integers())
+def test_compile_factory(topic: str, count: int) -> None:
+    """Check generated factory passes callbacks by field."""
+    callbacks = {'count': (lambda: count), 'topic': (lambda: topic)}
+    factory = compile_factory(MessageWithFields, tuple(callbacks))
+    assert factory is compile_factory(MessageWithFields, tuple(callbacks))  # cached
+    message = factory(LEVELS[1], 'message', callbacks)
+    assert message == MessageWithFields(LEVELS[1], 'message', topic, count)
+
+    message = compile_factory(MessageWithDefault, tuple(callbacks))(LEVELS[1], 'message', callbacks)
+    assert message == MessageWithDefault(LEVELS[1], 'message', topic, count, 'default')
+
+    callbacks = {'extra': (lambda: topic), 'count': (lambda: count), 'topic': (lambda: topic)}
+    message = compile_factory(MessageWithDefault, tuple(callbacks))(LEVELS[1], 'message', callbacks)
+    assert message == MessageWithDefault(LEVELS[1], 'message', topic, count, topic)
+
+    fields = {'topic': topic, 'extra': 'static'}
+    message = compile_factory(MessageWithDefault, ('count', 'extra'), tuple(fields))(LEVELS[1], 'message',
+                                                                                     callbacks, fields)
+    assert message == MessageWithDefault(LEVELS[1], 'message', topic, count, topic)  # callback wins
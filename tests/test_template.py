@@ -0,0 +1,85 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Compiled template unit tests."""
+
+# standard libs
+from io import StringIO
+from string import ascii_letters
+from datetime import datetime
+
+# internal libs
+from logalpha.color import ANSI_RESET, COLORS
+from logalpha.level import Level, LEVELS
+from logalpha.handler import TemplateHandler
+from logalpha.logger import Logger
+from logalpha.template import compile_template
+from logalpha.timestamp import ISO8601
+from logalpha.contrib.standard import StandardMessage
+
+# external libs
+from hypothesis import given, strategies as st
+import pytest
+
+
+@given(topic=st.text(ascii_letters), content=st.text(), value=st.integers(min_value=0, max_value=4))
+def test_compile(topic: str, content: str, value: int) -> None:
+    """Check compiled templates match the equivalent f-string."""
+    level = LEVELS[value]
+    timestamp = datetime.now()
+    message = StandardMessage(level, content, timestamp, topic, 'host')
+    template = compile_template('{timestamp} {host} {level:<8} [{topic!r}] {content} {{}} {level.value:03d}', LEVELS)
+    assert template(message) == (f'{timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]} host '
+                                 f'{level.name:<8} [{topic!r}] {content} {{}} {level.value:03d}')
+    template = compile_template('{level:>8}: {content}', LEVELS, COLORS)
+    assert template(message) == f'{COLORS[value].foreground}{level.name:>8}{ANSI_RESET}: {content}'
+    assert template is compile_template('{level:>8}: {content}', LEVELS, COLORS)  # cached
+
+
+def test_invalid() -> None:
+    """Check unsupported fields."""
+    for template in ('{}', '{0}', '{content[0]}', '{content:{spec}}'):
+        with pytest.raises(ValueError):
+            compile_template(template, LEVELS)
+
+
+def test_handler() -> None:
+    """Check handler recompiles when configured."""
+    message = StandardMessage(LEVELS[3], 'message', datetime(2020, 10, 12, 20, 48, 10, 555000), 'topic', 'host')
+    handler = TemplateHandler(resource=StringIO(), template='{level} {content}')
+    handler.write(message)
+    handler.template = '[{topic}] {content}'
+    handler.write(message)
+    handler.template = '{timestamp}'
+    handler.timestamp_format = ISO8601
+    handler.write(message)
+    lines = handler.resource.getvalue().splitlines()
+    assert lines[:2] == ['ERROR message', '[topic] message']
+    assert lines[2].startswith('2020-10-12T20:48:10.555')
+
+
+def test_custom_levels() -> None:
+    """Check level names are formatted for levels missing from the handler's table."""
+
+    class TraceLogger(Logger, scoped=True):
+        """More levels than the defaults."""
+
+        levels = Level.from_names(['TRACE', 'DEBUG', 'INFO', 'NOTICE', 'WARNING', 'ERROR', 'CRITICAL'])
+
+    log = TraceLogger()
+    plain = TemplateHandler(level=log.levels[0], resource=StringIO(), template='{level:<8}|{content}')
+    colored = TemplateHandler(level=log.levels[0], resource=StringIO(), template='{level}', colors=COLORS[:5])
+    log.handlers.extend([plain, colored])
+    for level in log.levels:
+        getattr(log, level.name.lower())('message')
+    assert plain.resource.getvalue().splitlines() == [f'{level.name:<8}|message' for level in log.levels]
+    assert colored.resource.getvalue().splitlines() == (
+        [f'{COLORS[level.value].foreground}{level.name}{ANSI_RESET}' for level in log.levels[:5]] +
+        [level.name for level in log.levels[5:]])
@@ -0,0 +1,71 @@
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the Apache License (v2.0) as published by the Apache Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the Apache License for more details.
+#
+# You should have received a copy of the Apache License along with this program.
+# If not, see <https://www.apache.org/licenses/LICENSE-2.0>.
+
+"""Timestamp formatting unit tests."""
+
+# standard libs
+from datetime import datetime, timezone, timedelta
+
+# internal libs
+from logalpha.timestamp import (TimestampFormat, DEFAULT, ISO8601, EPOCH, EPOCH_MS,
+                                WALL_NS, MONOTONIC_NS, to_datetime)
+
+# external libs
+from hypothesis import given, strategies as st
+import pytest
+
+
+@given(st.lists(st.datetimes(min_value=datetime(1980, 1, 1)), min_size=1, max_size=20))
+def test_default(timestamps) -> None:
+    """Check cached formatting matches strftime."""
+    for ts in sorted(timestamps):
+        assert DEFAULT(ts) == ts.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        assert DEFAULT(ts) == ts.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+
+@given(st.datetimes(min_value=datetime(1980, 1, 1)), st.integers(min_value=-12, max_value=12))
+def test_iso8601(ts: datetime, hours: int) -> None:
+    """Check ISO-8601 with UTC offset."""
+    ts = ts.replace(tzinfo=timezone(timedelta(hours=hours)))
+    assert ISO8601(ts) == ts.isoformat(timespec='milliseconds')
+
+
+@given(st.datetimes(min_value=datetime(1980, 1, 1), max_value=datetime(2100, 1, 1)))
+def test_epoch(ts: datetime) -> None:
+    """Check seconds and milliseconds since the epoch."""
+    ts = ts.replace(tzinfo=timezone.utc)
+    seconds = int(ts.replace(microsecond=0).timestamp())
+    assert EPOCH(ts) == f'{seconds}.{ts.microsecond // 1000:03d}'
+    assert EPOCH_MS(ts) == str(seconds * 1000 + ts.microsecond // 1000)
+
+
+def test_precision() -> None:
+    """Check fractional precision options."""
+    ts = datetime(2020, 10, 12, 20, 48, 10, 555123)
+    assert TimestampFormat(precision=0)(ts) == '2020-10-12 20:48:10'
+    assert TimestampFormat(precision=6)(ts) == '2020-10-12 20:48:10.555123'
+    with pytest.raises(ValueError):
+        TimestampFormat(precision=2)
+
+
+@given(st.integers(min_value=0, max_value=4_000_000_000 * 10**9))
+def test_nanoseconds(ns: int) -> None:
+    """Check integer nanoseconds are formatted like the equivalent datetime."""
+    ts = to_datetime(ns)
+    assert ts == datetime.fromtimestamp(ns // 10**9).replace(microsecond=ns // 1000 % 10**6)
+    for fmt in (DEFAULT, ISO8601, TimestampFormat(precision=6)):
+        assert fmt(ns) == fmt(ts)
+
+
+def test_monotonic() -> None:
+    """Check monotonic clock stays close to the wall clock."""
+    values = [MONOTONIC_NS() for _ in range(1000)]
+    assert values == sorted(values)
+    assert abs(MONOTONIC_NS() - WALL_NS()) < 10**9